@@ -5,6 +5,51 @@ Generates zone-specific evacuation and crowd control instructions
 
 from typing import Dict, List, Tuple, Optional
 import json
+import re
+import numpy as np
+
+# Optional: orjson serializes much faster than the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Runs of non-ASCII characters, which json.dump writes as \u escapes
+_NON_ASCII = re.compile(r'[^\x00-\x7f]+')
+
+
+def _escape_non_ascii(text: str) -> str:
+    """Escape non-ASCII characters exactly like json.dumps(ensure_ascii=True)"""
+    return _NON_ASCII.sub(lambda m: json.encoder.encode_basestring_ascii(m.group())[1:-1], text)
+
+
+def _orjson_matches_json(instructions: List[Dict]) -> bool:
+    """
+    Whether orjson would format every severity exactly like json.dump
+    
+    orjson writes NaN/inf as null and drops the '+' from exponents, so
+    anything non-finite or outside repr's fixed-point range falls back.
+    """
+    magnitude = np.abs(np.array([inst['severity'] for inst in instructions], dtype=np.float64))
+    return bool(np.all((magnitude == 0) | ((magnitude >= 1e-4) & (magnitude < 1e16))))
+
+
+# Exit locations (approximate centers of exit zones), by exit name
+EXIT_POSITIONS = {
+    'North': (0, 5),
+    'South': (9, 5),
+    'East': (5, 9),
+    'West': (5, 0)
+}
+
+# Code tables for the column-array view of instructions (see to_arrays)
+PRIORITY_ORDER = ['EMERGENCY', 'CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+EXIT_NAMES = list(EXIT_POSITIONS)
+
+# Exit codes in alphabetical order of exit name, for name-sorted reports
+EXIT_CODES_BY_NAME = sorted(range(len(EXIT_NAMES)), key=EXIT_NAMES.__getitem__)
 
 
 class InstructionGenerator:
@@ -25,6 +70,16 @@ class InstructionGenerator:
         # Define exit mappings
         self.exit_map = self._define_exit_regions()
         
+        # Region and exit ranking depend only on zone position, so look them up per zone
+        self._zone_regions = {
+            zone: region for region, zones in self.exit_map.items() for zone in zones
+        }
+        self._zone_exits = {
+            (i, j): self._rank_exits(i, j)
+            for i in range(self.grid_rows)
+            for j in range(self.grid_cols)
+        }
+        
         # Define instruction templates
         self.instruction_templates = self._create_instruction_templates()
         
@@ -157,11 +212,7 @@ class InstructionGenerator:
         Returns:
             Region name (North, South, East, West, Central)
         """
-        for region, zones in self.exit_map.items():
-            if (x, y) in zones:
-                return region
-        
-        return 'Central'  # Default
+        return self._zone_regions.get((x, y), 'Central')  # Default: Central
     
     def get_nearest_exits(self, x: int, y: int, max_exits: int = 2) -> List[str]:
         """
@@ -175,25 +226,33 @@ class InstructionGenerator:
         Returns:
             List of exit names, ordered by proximity
         """
-        # Define exit locations (approximate centers of exit zones)
-        exit_locations = {
-            'North': (0, 5),
-            'South': (9, 5),
-            'East': (5, 9),
-            'West': (5, 0)
-        }
+        ranked = self._zone_exits.get((x, y))
+        if ranked is None:
+            ranked = self._rank_exits(x, y)
+        
+        return ranked[:max_exits]
+    
+    def _rank_exits(self, x: int, y: int) -> List[str]:
+        """
+        Rank all exits by Manhattan distance from a zone (ties by name)
         
+        Args:
+            x: Row coordinate
+            y: Column coordinate
+            
+        Returns:
+            List of every exit name, nearest first
+        """
         # Calculate distances
         distances = []
-        for exit_name, (ex, ey) in exit_locations.items():
+        for exit_name, (ex, ey) in EXIT_POSITIONS.items():
             distance = abs(x - ex) + abs(y - ey)  # Manhattan distance
             distances.append((distance, exit_name))
         
-        # Sort by distance and return nearest exits
+        # Sort by distance
         distances.sort()
-        nearest = [exit_name for _, exit_name in distances[:max_exits]]
         
-        return nearest
+        return [exit_name for _, exit_name in distances]
     
     def generate_instruction(self, 
                            zone_id: str,
@@ -273,48 +332,101 @@ class InstructionGenerator:
         """
         instructions = []
         
-        for _, zone in classified_zones.iterrows():
+        # Read each needed column once instead of building a Series per row
+        columns = [
+            classified_zones[col].tolist()
+            for col in ('zone_id', 'x', 'y', 'level', 'severity')
+        ]
+        
+        for zone_id, x, y, level, severity in zip(*columns):
             instruction = self.generate_instruction(
-                zone_id=zone['zone_id'],
-                x=int(zone['x']),
-                y=int(zone['y']),
-                level=zone['level'],
-                severity=zone['severity']
+                zone_id=zone_id,
+                x=int(x),
+                y=int(y),
+                level=level,
+                severity=severity
             )
             instructions.append(instruction)
         
         return instructions
     
-    def get_priority_instructions(self, instructions: List[Dict]) -> List[Dict]:
+    def to_arrays(self, instructions: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Column-array view of instructions for vectorized filtering and counting
+        
+        Args:
+            instructions: List of instruction dictionaries
+            
+        Returns:
+            Dictionary of parallel arrays: 'severity' (float64), and 'priority'
+            and 'exit' codes indexing PRIORITY_ORDER and EXIT_NAMES
+        """
+        priority_codes = {priority: i for i, priority in enumerate(PRIORITY_ORDER)}
+        exit_codes = {name: i for i, name in enumerate(EXIT_NAMES)}
+        
+        return {
+            'severity': np.array([inst['severity'] for inst in instructions], dtype=np.float64),
+            'priority': np.array([priority_codes[inst['priority']] for inst in instructions], dtype=np.int8),
+            'exit': np.array([exit_codes[inst['primary_exit']] for inst in instructions], dtype=np.int16)
+        }
+    
+    def get_priority_instructions(self, instructions: List[Dict],
+                                  limit: Optional[int] = None) -> List[Dict]:
         """
         Filter and sort instructions by priority
         
         Args:
             instructions: List of instruction dictionaries
+            limit: Optional number of top instructions to return
             
         Returns:
             Sorted list of high-priority instructions
         """
-        priority_order = {
-            'EMERGENCY': 0,
-            'CRITICAL': 1,
-            'HIGH': 2,
-            'MEDIUM': 3,
-            'LOW': 4
-        }
+        arrays = self.to_arrays(instructions)
         
-        # Filter for actionable instructions
-        priority_instructions = [
-            inst for inst in instructions 
-            if inst['priority'] in ['EMERGENCY', 'CRITICAL', 'HIGH']
-        ]
+        # Filter for actionable instructions (EMERGENCY, CRITICAL, HIGH)
+        actionable = np.flatnonzero(arrays['priority'] <= PRIORITY_ORDER.index('HIGH'))
         
-        # Sort by priority
-        priority_instructions.sort(
-            key=lambda x: (priority_order[x['priority']], -x['severity'])
-        )
+        # Narrow to the top `limit` candidates before sorting
+        if limit is not None and 0 < limit < len(actionable):
+            actionable = self._top_candidates(actionable, arrays, limit)
+        
+        # Sort by priority, then severity descending (lexsort is stable, last key first)
+        order = np.lexsort((-arrays['severity'][actionable], arrays['priority'][actionable]))
+        
+        return [instructions[i] for i in actionable[order[:limit]]]
+    
+    def _top_candidates(self, actionable: np.ndarray, arrays: Dict[str, np.ndarray],
+                        limit: int) -> np.ndarray:
+        """
+        Select a superset of the top `limit` actionable instructions in O(N)
         
-        return priority_instructions
+        Higher priorities are kept whole; within the priority where the cut
+        falls, severities are partitioned and every tie with the cut-off
+        value is kept, so sorting the result gives the exact top `limit`.
+        
+        Args:
+            actionable: Indices of actionable instructions
+            arrays: Column arrays from to_arrays
+            limit: Number of top instructions wanted (0 < limit < len(actionable))
+            
+        Returns:
+            Candidate indices, in their original order
+        """
+        priority = arrays['priority'][actionable]
+        
+        # Priority code whose bucket contains the limit-th instruction
+        cut_priority = np.searchsorted(np.cumsum(np.bincount(priority)), limit)
+        keep = priority < cut_priority
+        
+        # Fill the remaining slots from that bucket by descending severity
+        bucket = np.flatnonzero(priority == cut_priority)
+        needed = limit - np.count_nonzero(keep)
+        neg_severity = -arrays['severity'][actionable[bucket]]
+        cutoff = np.partition(neg_severity, needed - 1)[needed - 1]
+        keep[bucket[(neg_severity <= cutoff) | np.isnan(cutoff)]] = True
+        
+        return actionable[keep]
     
     def format_instruction_display(self, instruction: Dict) -> str:
         """
@@ -339,29 +451,32 @@ class InstructionGenerator:
             Summary statistics
         """
         total = len(instructions)
-        
-        # Count by priority
-        priority_counts = {
-            'EMERGENCY': 0,
-            'CRITICAL': 0,
-            'HIGH': 0,
-            'MEDIUM': 0,
-            'LOW': 0
+        arrays = self.to_arrays(instructions)
+        
+        # Count by priority in one pass
+        priority_totals = np.bincount(arrays['priority'], minlength=len(PRIORITY_ORDER))
+        priority_counts = dict(zip(PRIORITY_ORDER, priority_totals.tolist()))
+        
+        # Count by exit, listing exits in order of first use
+        exit_totals = np.bincount(arrays['exit'], minlength=len(EXIT_NAMES))
+        used, first_seen = np.unique(arrays['exit'], return_index=True)
+        exit_usage = {
+            EXIT_NAMES[code]: exit_totals[code].item()
+            for code in used[np.argsort(first_seen)]
         }
         
-        for inst in instructions:
-            priority_counts[inst['priority']] += 1
-        
-        # Count by exit
-        exit_usage = {}
-        for inst in instructions:
-            exit_name = inst['primary_exit']
-            exit_usage[exit_name] = exit_usage.get(exit_name, 0) + 1
+        # Same counts as (name, count) pairs in name order, ready to print
+        exit_load = [
+            (EXIT_NAMES[code], count)
+            for code, count in zip(EXIT_CODES_BY_NAME, exit_totals[EXIT_CODES_BY_NAME].tolist())
+            if count > 0
+        ]
         
         summary = {
             'total_instructions': total,
             'priority_breakdown': priority_counts,
             'exit_usage': exit_usage,
+            'exit_load': exit_load,
             'requires_immediate_action': priority_counts['EMERGENCY'] + priority_counts['CRITICAL'],
             'zones_monitored': priority_counts['MEDIUM'] + priority_counts['LOW']
         }
@@ -376,8 +491,14 @@ class InstructionGenerator:
             instructions: List of instruction dictionaries
             filepath: Output file path
         """
-        with open(filepath, 'w') as f:
-            json.dump(instructions, f, indent=2)
+        if ORJSON_AVAILABLE and _orjson_matches_json(instructions):
+            # Same text as json.dump(indent=2): orjson writes UTF-8, so re-escape non-ASCII
+            text = orjson.dumps(instructions, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+            with open(filepath, 'w') as f:
+                f.write(_escape_non_ascii(text.decode('utf-8')))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(instructions, f, indent=2)
         
         print(f"✓ Instructions exported to: {filepath}")
     
@@ -404,6 +525,10 @@ class InstructionGenerator:
             print(f"\n{self.format_instruction_display(inst)}")
         
         print("\n" + "=" * 80)
+    
+    def reset_history(self):
+        """Clear tracked instructions so one generator can serve several scenarios"""
+        self.instruction_history = []
 
 
 # Testing function
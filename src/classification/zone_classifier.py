@@ -6,8 +6,120 @@ Classifies crowd zones based on density and movement parameters
 import json
 import os
 from typing import Dict, Tuple, Optional, List
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Elevation reasons, indexed by the kernel's reason code
+_ELEVATION_REASONS = (
+    None,
+    "Panic indicators detected (slow movement + chaos)",
+    "Orderly evacuation detected"
+)
+
+
+def _classify_kernel(density, speed, variance, has_movement,
+                     density_bounds, bound_levels,
+                     max_density, max_speed, max_variance, weights,
+                     panic_rule, orderly_rule):
+    """
+    Classify every zone of a frame; mirrors ZoneClassifier.classify_zone
+    
+    Args:
+        density: 1-D float64 array of densities
+        speed: 1-D float64 array of movement speeds
+        variance: 1-D float64 array of direction variances
+        has_movement: Whether speed/variance are available
+        density_bounds: (n_levels, 2) array of [density_min, density_max],
+            in threshold config order
+        bound_levels: Level index (into level_order) of each bounds row
+        max_density: Absolute max density for the severity score
+        max_speed: Speed at which the speed score bottoms out
+        max_variance: Variance at which the variance score tops out
+        weights: [density, speed, variance] severity weights
+        panic_rule: [enabled, speed_threshold, variance_threshold, elevation_amount]
+        orderly_rule: [enabled, speed_threshold, variance_threshold]
+        
+    Returns:
+        Tuple of (severity, level, base_level, reason) arrays; levels index
+        level_order and reason indexes _ELEVATION_REASONS
+    """
+    n = density.shape[0]
+    n_levels = density_bounds.shape[0]
+    
+    severity_out = np.empty(n)
+    level_out = np.empty(n, dtype=np.int64)
+    base_out = np.empty(n, dtype=np.int64)
+    reason_out = np.zeros(n, dtype=np.int64)
+    
+    for i in range(n):
+        d = density[i]
+        
+        # Primary classification by density (default: emergency, the top level)
+        base = n_levels - 1
+        for k in range(n_levels):
+            if density_bounds[k, 0] <= d < density_bounds[k, 1]:
+                base = bound_levels[k]
+                break
+        
+        # Severity score
+        density_score = min(100.0, (d / max_density) * 100)
+        
+        if has_movement:
+            s = speed[i]
+            v = variance[i]
+            speed_score = (1 - min(s, max_speed) / max_speed) * 100
+            variance_score = min(100.0, (v / max_variance) * 100)
+            severity = (
+                density_score * weights[0] +
+                speed_score * weights[1] +
+                variance_score * weights[2]
+            )
+        else:
+            severity = density_score
+        
+        severity_out[i] = max(0.0, min(100.0, severity))
+        
+        # Movement-based adjustment
+        level = base
+        if has_movement:
+            elevated = False
+            if panic_rule[0] and s < panic_rule[1] and v > panic_rule[2]:
+                level = min(base + int(panic_rule[3]), n_levels - 1)
+                if level != base:
+                    reason_out[i] = 1
+                    elevated = True
+            
+            if not elevated and orderly_rule[0] and s > orderly_rule[1] and v < orderly_rule[2]:
+                reason_out[i] = 2
+        
+        level_out[i] = level
+        base_out[i] = base
+    
+    return severity_out, level_out, base_out, reason_out
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load the cached build) at import time rather than on the first
+    # scenario's call. Column arrays are declared read-only so both pandas'
+    # copy-on-write views and freshly allocated arrays match the one signature.
+    _column = types.Array(types.float64, 1, 'A', readonly=True)
+    _vector = types.float64[:]
+    _codes = types.int64[:]
+    _classify_signature = types.Tuple((_vector, _codes, _codes, _codes))(
+        _column, _column, _column, types.boolean,
+        types.float64[:, :], _codes,
+        types.float64, types.float64, types.float64, _vector,
+        _vector, _vector
+    )
+    _classify_kernel = njit(_classify_signature, cache=True)(_classify_kernel)
+
 
 class ZoneClassifier:
     """
@@ -33,6 +145,34 @@ class ZoneClassifier:
         # Statistics tracking
         self.classification_history = []
         
+        # Threshold arrays for the batch classification kernel
+        self._density_bounds = np.array(
+            [[t['density_min'], t['density_max']] for t in self.thresholds.values()],
+            dtype=np.float64
+        )
+        self._bound_levels = np.array(
+            [self.level_order.index(level) for level in self.thresholds], dtype=np.int64
+        )
+        panic = self.elevation_rules['panic_detection']
+        orderly = self.elevation_rules['orderly_evacuation']
+        self._panic_rule = np.array([
+            panic['enabled'], panic['speed_threshold'],
+            panic['variance_threshold'], panic['elevation_amount']
+        ], dtype=np.float64)
+        self._orderly_rule = np.array([
+            orderly['enabled'], orderly['speed_threshold'], orderly['variance_threshold']
+        ], dtype=np.float64)
+        self._severity_weights = np.array([
+            self.severity_weights['density_weight'],
+            self.severity_weights['speed_weight'],
+            self.severity_weights['variance_weight']
+        ], dtype=np.float64)
+        self._score_limits = (
+            float(self.config['capacity_settings']['absolute_max_density']),
+            float(self.movement_thresholds['speed']['fast']),
+            float(self.movement_thresholds['direction_variance']['panic'])
+        )
+        
     def _load_config(self, config_path: str) -> Dict:
         """Load classification configuration from JSON file"""
         if not os.path.exists(config_path):
@@ -190,7 +330,7 @@ class ZoneClassifier:
                 )
                 
                 if elevated_level != base_level:
-                    return elevated_level, "Panic indicators detected (slow movement + chaos)"
+                    return elevated_level, _ELEVATION_REASONS[1]
         
         # Check for orderly evacuation (no elevation needed)
         if self.elevation_rules['orderly_evacuation']['enabled']:
@@ -199,7 +339,7 @@ class ZoneClassifier:
             
             # High speed + low variance = orderly movement
             if speed > orderly_speed and variance < orderly_variance:
-                return base_level, "Orderly evacuation detected"
+                return base_level, _ELEVATION_REASONS[2]
         
         return base_level, None
     
@@ -225,39 +365,52 @@ class ZoneClassifier:
         """
         Classify all zones in a frame
         
+        Runs the whole frame through _classify_kernel at once; results match
+        classify_zone zone by zone, but are not added to classification_history.
+        
         Args:
             frame_data: DataFrame with zone data
             
         Returns:
             DataFrame with classification results
         """
-        results = []
-        
-        for _, zone in frame_data.iterrows():
-            classification = self.classify_zone(
-                density=zone['density'],
-                speed=zone.get('movement_speed'),
-                variance=zone.get('direction_variance'),
-                zone_id=zone.get('zone_id')
-            )
-            
-            results.append({
-                'zone_id': classification['zone_id'],
-                'x': zone['x_coord'],
-                'y': zone['y_coord'],
-                'level': classification['level'],
-                'base_level': classification['base_level'],
-                'color': classification['color'],
-                'severity': classification['severity_score'],
-                'density': classification['density'],
-                'speed': classification['speed'],
-                'variance': classification['variance'],
-                'requires_action': classification['requires_action'],
-                'elevated': classification['elevated'],
-                'elevation_reason': classification['elevation_reason']
-            })
-        
-        return pd.DataFrame(results)
+        n = len(frame_data)
+        density = frame_data['density'].to_numpy(dtype=np.float64)
+        
+        # Movement adjustments only apply when both columns are present
+        has_movement = ('movement_speed' in frame_data and
+                        'direction_variance' in frame_data)
+        if has_movement:
+            speed = frame_data['movement_speed'].to_numpy(dtype=np.float64)
+            variance = frame_data['direction_variance'].to_numpy(dtype=np.float64)
+        else:
+            speed = variance = np.zeros(n)
+        
+        severity, level_idx, base_idx, reason_idx = _classify_kernel(
+            density, speed, variance, has_movement,
+            self._density_bounds, self._bound_levels,
+            *self._score_limits,
+            self._severity_weights, self._panic_rule, self._orderly_rule
+        )
+        
+        # Map level indices back to names and per-level attributes
+        levels = [self.level_order[i] for i in level_idx]
+        
+        return pd.DataFrame({
+            'zone_id': frame_data['zone_id'].tolist() if 'zone_id' in frame_data else [None] * n,
+            'x': frame_data['x_coord'].to_numpy(),
+            'y': frame_data['y_coord'].to_numpy(),
+            'level': levels,
+            'base_level': [self.level_order[i] for i in base_idx],
+            'color': [self.thresholds[level]['color_hex'] for level in levels],
+            'severity': [round(value, 2) for value in severity.tolist()],
+            'density': density,
+            'speed': speed if has_movement else [None] * n,
+            'variance': variance if has_movement else [None] * n,
+            'requires_action': [self.thresholds[level]['requires_action'] for level in levels],
+            'elevated': level_idx != base_idx,
+            'elevation_reason': [_ELEVATION_REASONS[i] for i in reason_idx]
+        })
     
     def get_classification_summary(self, classified_zones: pd.DataFrame) -> Dict:
         """
@@ -281,11 +434,17 @@ class ZoneClassifier:
             'elevated_zones': classified_zones['elevated'].sum()
         }
         
-        # Count each level
-        for level in self.level_order:
-            count = len(classified_zones[classified_zones['level'] == level])
-            summary['level_counts'][level] = count
-            summary['level_percentages'][level] = (count / total_zones * 100) if total_zones > 0 else 0
+        # Count every level in one pass over small-int level codes
+        codes = pd.Categorical(classified_zones['level'], categories=self.level_order).codes
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.level_order))
+        
+        percentages = (counts / total_zones * 100).tolist() if total_zones > 0 else [0] * len(counts)
+        
+        summary['level_counts'] = dict(zip(self.level_order, counts.tolist()))
+        summary['level_percentages'] = dict(zip(self.level_order, percentages))
+        
+        # Same figures as (level, count, percentage) rows in level order, ready to print
+        summary['level_table'] = list(zip(self.level_order, counts.tolist(), percentages))
         
         return summary
     
@@ -6,8 +6,73 @@ Handles loading, validation, and preprocessing of crowd data
 import pandas as pd
 import numpy as np
 import os
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, List
 
+try:
+    import pyarrow  # noqa: F401 (only needed by the pyarrow CSV engine)
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# Optional: joblib persists parsed scenarios on disk across runs
+try:
+    from joblib import Memory
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+# Disk cache location, anchored at the repo root regardless of the working directory
+SCENARIO_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    '.cache', 'scenarios'
+)
+
+
+# Column types of the scenario CSVs, so the parser skips type inference
+SCENARIO_DTYPES = {
+    'timestamp': 'int64',
+    'zone_id': 'str',
+    'x_coord': 'int64',
+    'y_coord': 'int64',
+    'density': 'float64',
+    'people_count': 'int64',
+    'movement_speed': 'float64',
+    'direction_variance': 'float64'
+}
+
+
+def _parse_scenario_csv(filepath: str, mtime_ns: int) -> pd.DataFrame:
+    """Parse a scenario CSV (mtime_ns only keys the disk cache)"""
+    return pd.read_csv(filepath, engine=CSV_ENGINE, dtype=SCENARIO_DTYPES)
+
+
+@lru_cache(maxsize=1)
+def _disk_cached_parser():
+    """Wrap the CSV parser in the joblib disk cache (creates the cache directory on first use)"""
+    return Memory(SCENARIO_CACHE_DIR, verbose=0).cache(_parse_scenario_csv)
+
+
+@lru_cache(maxsize=8)
+def _read_scenario_csv(filepath: str, mtime_ns: int) -> pd.DataFrame:
+    """
+    Parse a scenario CSV once per process (and once per file version on disk
+    when joblib is installed)
+    
+    Args:
+        filepath: Path to scenario CSV file
+        mtime_ns: File modification time; part of the cache key so a
+            regenerated file is parsed again
+        
+    Returns:
+        Parsed DataFrame (shared - callers must copy before modifying)
+    """
+    if JOBLIB_AVAILABLE:
+        # Absolute path, so relative paths from different directories don't share entries
+        return _disk_cached_parser()(os.path.abspath(filepath), mtime_ns)
+    
+    return _parse_scenario_csv(filepath, mtime_ns)
+
 
 class CrowdDataProcessor:
     """
@@ -31,6 +96,15 @@ class CrowdDataProcessor:
         self.scenario_name = None
         self.scenario_stats = {}
         
+        # Per-timestamp caches for the loaded scenario (reset on load)
+        self._frame_cache = {}
+        self._density_tensor = None
+        self._tensor_timestamps = None
+        self._timestamps_sorted = False
+        
+        # Scenarios preloaded by load_all_scenarios, by name
+        self._scenarios = {}
+        
     def load_scenario(self, filepath: str) -> pd.DataFrame:
         """
         Load scenario data from CSV file
@@ -47,11 +121,10 @@ class CrowdDataProcessor:
         print(f"Loading scenario from: {filepath}")
         
         try:
-            df = pd.read_csv(filepath)
+            df = _read_scenario_csv(filepath, os.stat(filepath).st_mtime_ns).copy()
             
             # Store scenario info
-            self.current_scenario = df
-            self.scenario_name = os.path.basename(filepath).replace('_scenario.csv', '')
+            self._set_current(df, os.path.basename(filepath).replace('_scenario.csv', ''))
             
             # Validate loaded data
             self._validate_data(df)
@@ -68,6 +141,54 @@ class CrowdDataProcessor:
         except Exception as e:
             raise Exception(f"Error loading scenario: {str(e)}")
     
+    def load_all_scenarios(self, filepaths: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Load and validate several scenarios up front
+        
+        Switch between them with select(); the last one loaded stays active.
+        
+        Args:
+            filepaths: Paths to scenario CSV files
+            
+        Returns:
+            Dictionary mapping scenario name to its DataFrame
+        """
+        for filepath in filepaths:
+            df = self.load_scenario(filepath)
+            self._scenarios[self.scenario_name] = (df, self.scenario_stats)
+        
+        return {name: df for name, (df, _) in self._scenarios.items()}
+    
+    def select(self, scenario_name: str) -> pd.DataFrame:
+        """
+        Make a scenario preloaded by load_all_scenarios the active one
+        
+        Args:
+            scenario_name: Scenario name (e.g., 'emergency')
+            
+        Returns:
+            DataFrame with scenario data
+        """
+        if scenario_name not in self._scenarios:
+            raise ValueError(f"Scenario not loaded: {scenario_name}")
+        
+        df, stats = self._scenarios[scenario_name]
+        self._set_current(df, scenario_name)
+        self.scenario_stats = stats
+        
+        return df
+    
+    def _set_current(self, df: pd.DataFrame, scenario_name: str):
+        """Activate a scenario and reset its per-timestamp caches"""
+        self.current_scenario = df
+        self.scenario_name = scenario_name
+        self._frame_cache = {}
+        self._density_tensor = None
+        self._tensor_timestamps = None
+        
+        # Generated scenarios are timestamp-major, so frames are contiguous row ranges
+        self._timestamps_sorted = df['timestamp'].is_monotonic_increasing
+    
     def _validate_data(self, df: pd.DataFrame) -> bool:
         """
         Validate data integrity and quality
@@ -199,10 +320,22 @@ class CrowdDataProcessor:
         if self.current_scenario is None:
             raise ValueError("No scenario loaded. Call load_scenario() first.")
         
-        frame = self.current_scenario[self.current_scenario['timestamp'] == timestamp]
-        
-        if len(frame) == 0:
-            raise ValueError(f"No data found for timestamp {timestamp}")
+        frame = self._frame_cache.get(timestamp)
+        
+        if frame is None:
+            if self._timestamps_sorted:
+                # Binary search for the frame's row range instead of a full mask
+                timestamps = self.current_scenario['timestamp'].to_numpy()
+                start = np.searchsorted(timestamps, timestamp, side='left')
+                end = np.searchsorted(timestamps, timestamp, side='right')
+                frame = self.current_scenario.iloc[start:end]
+            else:
+                frame = self.current_scenario[self.current_scenario['timestamp'] == timestamp]
+            
+            if len(frame) == 0:
+                raise ValueError(f"No data found for timestamp {timestamp}")
+            
+            self._frame_cache[timestamp] = frame
         
         return frame.copy()
     
@@ -263,17 +396,45 @@ class CrowdDataProcessor:
         Returns:
             2D numpy array of densities
         """
-        frame = self.get_frame(timestamp)
+        tensor = self.create_density_tensor()
+        index = timestamp - self.current_scenario['timestamp'].min()
         
-        # Initialize grid
-        grid = np.zeros((self.grid_rows, self.grid_cols))
+        # Timestamps inside the range can still be missing (their grid is all zeros)
+        if not (0 <= index < len(tensor) and self._tensor_timestamps[index]):
+            raise ValueError(f"No data found for timestamp {timestamp}")
         
-        # Fill grid with density values
-        for _, row in frame.iterrows():
-            x, y = int(row['x_coord']), int(row['y_coord'])
-            grid[x, y] = row['density']
+        return tensor[index].copy()
+    
+    def create_density_tensor(self) -> np.ndarray:
+        """
+        Create density grids for every timestamp in one pass
         
-        return grid
+        Returns:
+            3D numpy array (timestamps, rows, cols); index 0 is the first
+            timestamp of the scenario
+        """
+        if self.current_scenario is None:
+            raise ValueError("No scenario loaded. Call load_scenario() first.")
+        
+        if self._density_tensor is None:
+            values = self.current_scenario[['timestamp', 'x_coord', 'y_coord', 'density']].to_numpy()
+            ts = values[:, 0].astype(np.intp)
+            ts -= ts.min()
+            xs = values[:, 1].astype(np.intp)
+            ys = values[:, 2].astype(np.intp)
+            
+            # Scatter every record into its (timestamp, row, col) cell
+            tensor = np.zeros((ts.max() + 1, self.grid_rows, self.grid_cols))
+            tensor[ts, xs, ys] = values[:, 3]
+            
+            # Which tensor slices have records
+            present = np.zeros(len(tensor), dtype=bool)
+            present[ts] = True
+            
+            self._density_tensor = tensor
+            self._tensor_timestamps = present
+        
+        return self._density_tensor
     
     def create_speed_grid(self, timestamp: int) -> np.ndarray:
         """
@@ -487,16 +648,23 @@ def test_data_processor():
     processor = CrowdDataProcessor()
     scenarios = ['normal', 'rush_hour', 'emergency', 'event_end']
     
+    # Load every scenario once, then switch between them
+    try:
+        processor.load_all_scenarios(
+            [f'data/synthetic/{name}_scenario.csv' for name in scenarios]
+        )
+    except Exception as e:
+        print(f"\n❌ ERROR: {str(e)}")
+        return
+    
     for scenario_name in scenarios:
         print(f"\n{'='*60}")
         print(f"Testing: {scenario_name.upper()}")
         print(f"{'='*60}")
         
-        filepath = f'data/synthetic/{scenario_name}_scenario.csv'
-        
         try:
-            # Load scenario
-            df = processor.load_scenario(filepath)
+            # Select scenario
+            df = processor.select(scenario_name)
             
             # Print statistics
             processor.print_statistics()
@@ -0,0 +1,62 @@
+"""
+Parallel Scenario Runner
+Runs independent per-scenario jobs in worker processes
+"""
+
+import io
+import os
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+
+def _run_captured(func: Callable, *args):
+    """
+    Run func in a worker, capturing everything it prints
+    
+    Args:
+        func: Top-level (picklable) function
+        *args: Positional arguments for func
+    
+    Returns:
+        Tuple of (result, printed output)
+    """
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = func(*args)
+    
+    return result, buffer.getvalue()
+
+
+def run_scenarios_parallel(func: Callable, cases: list,
+                           max_workers: Optional[int] = None) -> List:
+    """
+    Run func(*case) for every case across worker processes
+    
+    Scenarios share nothing, so with a core per case wall time is roughly
+    that of the slowest one. Each worker's output is replayed in case order once it finishes,
+    which keeps the console log readable.
+    
+    Args:
+        func: Top-level (picklable) function, e.g. generate_scenario_heatmaps
+        cases: List of argument tuples, e.g. [('normal', 100), ...]
+        max_workers: Process count (defaults to one per case, capped at the
+            CPU count)
+    
+    Returns:
+        List of func results, in case order
+    """
+    if not cases:
+        return []
+    
+    results = []
+    workers = max_workers or max(1, min(len(cases), os.cpu_count() or 1))
+    
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(_run_captured, func, *case) for case in cases]
+        for future in futures:
+            result, output = future.result()
+            print(output, end='')
+            results.append(result)
+    
+    return results
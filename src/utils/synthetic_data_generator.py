@@ -6,6 +6,78 @@ Generates realistic crowd behavior scenarios for testing
 import numpy as np
 import pandas as pd
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _event_end_kernel(duration, rows, cols, exit_positions, seed):
+    """
+    Compute event end density, speed and direction variance grids
+    
+    Args:
+        duration: Number of timesteps
+        rows: Grid rows
+        cols: Grid columns
+        exit_positions: (n_exits, 2) integer array of exit coordinates
+        seed: Random seed
+        
+    Returns:
+        Tuple of (density, speed, direction_variance) arrays of shape
+        (duration, rows, cols)
+    """
+    np.random.seed(seed)
+    
+    density_out = np.empty((duration, rows, cols))
+    speed_out = np.empty((duration, rows, cols))
+    variance_out = np.empty((duration, rows, cols))
+    
+    # Distance to nearest exit is static
+    min_dist = np.empty((rows, cols))
+    for i in range(rows):
+        for j in range(cols):
+            best = abs(i - exit_positions[0, 0]) + abs(j - exit_positions[0, 1])
+            for k in range(1, exit_positions.shape[0]):
+                dist = abs(i - exit_positions[k, 0]) + abs(j - exit_positions[k, 1])
+                if dist < best:
+                    best = dist
+            min_dist[i, j] = best
+    
+    # Sequential loop keeps the random stream identical to NumPy's
+    for t in range(duration):
+        time_factor = t / duration
+        base_density = 1.0 + 5.0 * time_factor
+        
+        for i in range(rows):
+            for j in range(cols):
+                exit_proximity = 1.0 + (10 - min_dist[i, j]) / 15
+                density = base_density * exit_proximity
+                
+                if density < 3:
+                    speed = np.random.uniform(1.0, 1.5)
+                elif density < 5:
+                    speed = np.random.uniform(0.6, 1.0)
+                else:
+                    speed = np.random.uniform(0.3, 0.6)
+                
+                direction_variance = 30 + min(100.0, density * 15)
+                
+                density += np.random.normal(0, 0.3)
+                density = max(0.0, min(8.0, density))
+                
+                density_out[t, i, j] = density
+                speed_out[t, i, j] = speed
+                variance_out[t, i, j] = direction_variance
+    
+    return density_out, speed_out, variance_out
+
+
+if NUMBA_AVAILABLE:
+    _event_end_kernel = njit(cache=True)(_event_end_kernel)
 
 
 class SyntheticCrowdGenerator:
@@ -25,6 +97,11 @@ class SyntheticCrowdGenerator:
         self.grid_cols = grid_size[1]
         self.zone_area = zone_area
         self.total_zones = self.grid_rows * self.grid_cols
+        self.zone_ids = [
+            f'Zone_{i}_{j}'
+            for i in range(self.grid_rows)
+            for j in range(self.grid_cols)
+        ]
         
     def generate_normal_scenario(self, duration=200, seed=42):
         """
@@ -34,7 +111,8 @@ class SyntheticCrowdGenerator:
         print("Generating Normal Scenario...")
         np.random.seed(seed)
         
-        data = []
+        shape = (duration, self.grid_rows, self.grid_cols)
+        density, speed, direction_variance = np.empty(shape), np.empty(shape), np.empty(shape)
         
         for t in range(duration):
             for i in range(self.grid_rows):
@@ -49,28 +127,13 @@ class SyntheticCrowdGenerator:
                     temporal_factor = 1.0 + 0.1 * np.sin(t / 20)
                     
                     # Final density
-                    density = max(0, base_density + spatial_noise) * temporal_factor
+                    density[t, i, j] = max(0, base_density + spatial_noise) * temporal_factor
                     
                     # Movement parameters (normal behavior)
-                    speed = np.random.uniform(0.8, 1.5)  # Normal walking
-                    direction_variance = np.random.uniform(20, 60)  # Some variation
-                    
-                    # Calculate people count
-                    people_count = int(density * self.zone_area)
-                    
-                    # Create record
-                    data.append({
-                        'timestamp': t,
-                        'zone_id': f'Zone_{i}_{j}',
-                        'x_coord': i,
-                        'y_coord': j,
-                        'density': round(density, 2),
-                        'people_count': people_count,
-                        'movement_speed': round(speed, 2),
-                        'direction_variance': round(direction_variance, 1)
-                    })
-        
-        df = pd.DataFrame(data)
+                    speed[t, i, j] = np.random.uniform(0.8, 1.5)  # Normal walking
+                    direction_variance[t, i, j] = np.random.uniform(20, 60)  # Some variation
+        
+        df = self._grids_to_dataframe(density, speed, direction_variance)
         print(f"✓ Normal Scenario: {len(df)} records generated")
         return df
     
@@ -82,7 +145,8 @@ class SyntheticCrowdGenerator:
         print("Generating Rush Hour Scenario...")
         np.random.seed(seed)
         
-        data = []
+        shape = (duration, self.grid_rows, self.grid_cols)
+        density, speed, direction_variance = np.empty(shape), np.empty(shape), np.empty(shape)
         
         # Define high-traffic zones (entrance, popular areas)
         high_traffic_zones = [
@@ -100,13 +164,13 @@ class SyntheticCrowdGenerator:
                     if is_high_traffic:
                         # Higher density in traffic zones
                         base_density = np.random.uniform(3.0, 5.0)
-                        speed = np.random.uniform(0.5, 1.0)  # Slower due to crowding
-                        direction_variance = np.random.uniform(60, 100)  # More chaotic
+                        zone_speed = np.random.uniform(0.5, 1.0)  # Slower due to crowding
+                        zone_variance = np.random.uniform(60, 100)  # More chaotic
                     else:
                         # Normal density elsewhere
                         base_density = np.random.uniform(2.0, 3.5)
-                        speed = np.random.uniform(0.8, 1.3)
-                        direction_variance = np.random.uniform(40, 70)
+                        zone_speed = np.random.uniform(0.8, 1.3)
+                        zone_variance = np.random.uniform(40, 70)
                     
                     # Spatial correlation
                     if i > 0:
@@ -116,22 +180,12 @@ class SyntheticCrowdGenerator:
                     
                     # Temporal variation (rush builds and subsides)
                     rush_factor = 1.0 + 0.3 * np.sin(t / 30)
-                    density = max(0, base_density * rush_factor)
-                    
-                    people_count = int(density * self.zone_area)
                     
-                    data.append({
-                        'timestamp': t,
-                        'zone_id': f'Zone_{i}_{j}',
-                        'x_coord': i,
-                        'y_coord': j,
-                        'density': round(density, 2),
-                        'people_count': people_count,
-                        'movement_speed': round(speed, 2),
-                        'direction_variance': round(direction_variance, 1)
-                    })
-        
-        df = pd.DataFrame(data)
+                    density[t, i, j] = max(0, base_density * rush_factor)
+                    speed[t, i, j] = zone_speed
+                    direction_variance[t, i, j] = zone_variance
+        
+        df = self._grids_to_dataframe(density, speed, direction_variance)
         print(f"✓ Rush Hour Scenario: {len(df)} records generated")
         return df
     
@@ -141,58 +195,48 @@ class SyntheticCrowdGenerator:
         High density, erratic movement, critical zones
         """
         print("Generating Emergency Scenario...")
-        np.random.seed(seed)
-        
-        data = []
+        rng = np.random.default_rng(seed)
+        shape = (self.grid_rows, self.grid_cols)
         
         # Emergency starts at timestamp 30
-        emergency_start = 30
+        emergency_start = min(30, duration)
+        emergency_steps = duration - emergency_start
         
-        for t in range(duration):
-            for i in range(self.grid_rows):
-                for j in range(self.grid_cols):
-                    # Calculate distance from exits (bottom rows are exits)
-                    dist_from_exit = abs(i - 9) + abs(j - 5)
-                    
-                    if t < emergency_start:
-                        # Normal conditions before emergency
-                        base_density = np.random.uniform(2.0, 4.0)
-                        speed = np.random.uniform(0.8, 1.4)
-                        direction_variance = np.random.uniform(30, 60)
-                    else:
-                        # Emergency conditions
-                        # Higher density near exits (everyone rushing there)
-                        exit_factor = 1.0 + (10 - dist_from_exit) / 10
-                        
-                        # Panic builds over time
-                        panic_factor = 1.0 + (t - emergency_start) / 100
-                        
-                        base_density = np.random.uniform(4.0, 7.5) * exit_factor
-                        
-                        # Panic movement: very slow due to crowding
-                        speed = np.random.uniform(0.2, 0.8)
-                        
-                        # High direction variance (chaotic)
-                        direction_variance = np.random.uniform(100, 180) * panic_factor
-                    
-                    # Spatial correlation (panic spreads)
-                    spatial_noise = np.random.normal(0, 0.4)
-                    density = max(0, min(10, base_density + spatial_noise))  # Cap at 10
-                    
-                    people_count = int(density * self.zone_area)
-                    
-                    data.append({
-                        'timestamp': t,
-                        'zone_id': f'Zone_{i}_{j}',
-                        'x_coord': i,
-                        'y_coord': j,
-                        'density': round(density, 2),
-                        'people_count': people_count,
-                        'movement_speed': round(speed, 2),
-                        'direction_variance': round(direction_variance, 1)
-                    })
-        
-        df = pd.DataFrame(data)
+        # Calculate distance from exits (bottom rows are exits)
+        i, j = np.ogrid[:self.grid_rows, :self.grid_cols]
+        dist_from_exit = np.abs(i - 9) + np.abs(j - 5)
+        
+        # Normal conditions before emergency
+        pre_density = rng.uniform(2.0, 4.0, (emergency_start,) + shape)
+        pre_speed = rng.uniform(0.8, 1.4, (emergency_start,) + shape)
+        pre_variance = rng.uniform(30, 60, (emergency_start,) + shape)
+        
+        # Emergency conditions
+        # Higher density near exits (everyone rushing there)
+        exit_factor = 1.0 + (10 - dist_from_exit) / 10
+        
+        # Panic builds over time
+        panic_factor = 1.0 + np.arange(emergency_steps) / 100
+        
+        post_density = rng.uniform(4.0, 7.5, (emergency_steps,) + shape) * exit_factor
+        
+        # Panic movement: very slow due to crowding
+        post_speed = rng.uniform(0.2, 0.8, (emergency_steps,) + shape)
+        
+        # High direction variance (chaotic)
+        post_variance = (
+            rng.uniform(100, 180, (emergency_steps,) + shape) * panic_factor[:, None, None]
+        )
+        
+        base_density = np.concatenate([pre_density, post_density])
+        speed = np.concatenate([pre_speed, post_speed])
+        direction_variance = np.concatenate([pre_variance, post_variance])
+        
+        # Spatial correlation (panic spreads)
+        spatial_noise = rng.normal(0, 0.4, base_density.shape)
+        density = np.clip(base_density + spatial_noise, 0, 10)  # Cap at 10
+        
+        df = self._grids_to_dataframe(density, speed, direction_variance)
         print(f"✓ Emergency Scenario: {len(df)} records generated")
         return df
     
@@ -202,69 +246,56 @@ class SyntheticCrowdGenerator:
         Gradually increasing density as people leave
         """
         print("Generating Event End Scenario...")
-        np.random.seed(seed)
-        
-        data = []
         
         # Exit locations (people move toward these)
-        exit_zones = [
+        exit_zones = np.array([
             (9, 2), (9, 3),  # West exit
             (9, 7), (9, 8),  # East exit
             (0, 4), (0, 5)   # North exit
-        ]
+        ])
         
-        for t in range(duration):
-            # Density gradually increases as event ends
-            time_factor = t / duration  # 0 to 1
-            
-            for i in range(self.grid_rows):
-                for j in range(self.grid_cols):
-                    # Calculate distance to nearest exit
-                    min_dist = min(
-                        abs(i - ex) + abs(j - ey) 
-                        for ex, ey in exit_zones
-                    )
-                    
-                    # Density higher near exits as time progresses
-                    base_density = 1.0 + 5.0 * time_factor
-                    
-                    # Exit proximity factor (more crowded near exits)
-                    exit_proximity = 1.0 + (10 - min_dist) / 15
-                    
-                    density = base_density * exit_proximity
-                    
-                    # Movement speed depends on density
-                    if density < 3:
-                        speed = np.random.uniform(1.0, 1.5)  # Fast
-                    elif density < 5:
-                        speed = np.random.uniform(0.6, 1.0)  # Moderate
-                    else:
-                        speed = np.random.uniform(0.3, 0.6)  # Slow
-                    
-                    # Direction variance increases with density
-                    direction_variance = 30 + min(100, density * 15)
-                    
-                    # Add randomness
-                    density += np.random.normal(0, 0.3)
-                    density = max(0, min(8, density))  # Clamp between 0-8
-                    
-                    people_count = int(density * self.zone_area)
-                    
-                    data.append({
-                        'timestamp': t,
-                        'zone_id': f'Zone_{i}_{j}',
-                        'x_coord': i,
-                        'y_coord': j,
-                        'density': round(density, 2),
-                        'people_count': people_count,
-                        'movement_speed': round(speed, 2),
-                        'direction_variance': round(direction_variance, 1)
-                    })
-        
-        df = pd.DataFrame(data)
+        density, speed, direction_variance = _event_end_kernel(
+            duration, self.grid_rows, self.grid_cols, exit_zones, seed
+        )
+        
+        df = self._grids_to_dataframe(density, speed, direction_variance)
         print(f"✓ Event End Scenario: {len(df)} records generated")
         return df
     
+    def _grids_to_dataframe(self, density, speed, direction_variance):
+        """
+        Build scenario records from stacked grids
+        
+        Values are rounded here for serialization only; people_count is
+        derived from the unrounded density.
+        
+        Args:
+            density: Array of shape (timesteps, rows, cols)
+            speed: Array of shape (timesteps, rows, cols)
+            direction_variance: Array of shape (timesteps, rows, cols)
+            
+        Returns:
+            DataFrame with one record per zone per timestep
+        """
+        steps = density.shape[0]
+        rows, cols = np.divmod(np.arange(self.total_zones), self.grid_cols)
+        
+        return pd.DataFrame({
+            'timestamp': np.repeat(np.arange(steps), self.total_zones),
+            'zone_id': self.zone_ids * steps,
+            'x_coord': np.tile(rows, steps),
+            'y_coord': np.tile(cols, steps),
+            'density': np.round(density.ravel(), 2),
+            'people_count': (density.ravel() * self.zone_area).astype(int),
+            'movement_speed': np.round(speed.ravel(), 2),
+            'direction_variance': np.round(direction_variance.ravel(), 1)
+        })
+    
+    def _scenario_path(self, scenario_name, output_dir):
+        """Build the CSV path for a scenario"""
+        filename = f'{scenario_name.lower().replace(" ", "_")}_scenario.csv'
+        return os.path.join(output_dir, filename)
+    
     def save_scenario(self, df, scenario_name, output_dir='data/synthetic'):
         """
         Save scenario to CSV file
@@ -273,8 +304,7 @@ class SyntheticCrowdGenerator:
         os.makedirs(output_dir, exist_ok=True)
         
         # Generate filename
-        filename = f'{scenario_name.lower().replace(" ", "_")}_scenario.csv'
-        filepath = os.path.join(output_dir, filename)
+        filepath = self._scenario_path(scenario_name, output_dir)
         
         # Save to CSV
         df.to_csv(filepath, index=False)
@@ -291,30 +321,33 @@ class SyntheticCrowdGenerator:
         print("=" * 60)
         print()
         
-        scenarios = []
+        # Scenarios are independent (own seed, own output file), so generate
+        # them in parallel and keep the CSV writes serial in this process
+        jobs = [
+            ('Normal', 'normal', self.generate_normal_scenario, 200),
+            ('Rush Hour', 'rush_hour', self.generate_rush_hour_scenario, 200),
+            ('Emergency', 'emergency', self.generate_emergency_scenario, 150),
+            ('Event End', 'event_end', self.generate_event_end_scenario, 250)
+        ]
         
-        # 1. Normal Scenario
-        df_normal = self.generate_normal_scenario(duration=200)
-        path_normal = self.save_scenario(df_normal, 'normal')
-        scenarios.append(('Normal', df_normal, path_normal))
-        print()
+        generated = {}
         
-        # 2. Rush Hour Scenario
-        df_rush = self.generate_rush_hour_scenario(duration=200)
-        path_rush = self.save_scenario(df_rush, 'rush_hour')
-        scenarios.append(('Rush Hour', df_rush, path_rush))
-        print()
+        with ProcessPoolExecutor(max_workers=len(jobs)) as ex:
+            futures = {
+                ex.submit(generate, duration=duration): name
+                for name, _, generate, duration in jobs
+            }
+            for future in as_completed(futures):
+                generated[futures[future]] = future.result()
         
-        # 3. Emergency Scenario
-        df_emergency = self.generate_emergency_scenario(duration=150)
-        path_emergency = self.save_scenario(df_emergency, 'emergency')
-        scenarios.append(('Emergency', df_emergency, path_emergency))
         print()
+        scenarios = []
         
-        # 4. Event End Scenario
-        df_event = self.generate_event_end_scenario(duration=250)
-        path_event = self.save_scenario(df_event, 'event_end')
-        scenarios.append(('Event End', df_event, path_event))
+        # Save in the canonical scenario order
+        for name, key, _, _ in jobs:
+            df = generated[name]
+            path = self.save_scenario(df, key)
+            scenarios.append((name, df, path))
         print()
         
         print("=" * 60)
@@ -331,6 +364,8 @@ class SyntheticCrowdGenerator:
 
 # Main execution
 if __name__ == '__main__':
+    from verify_data import DataVerifier
+    
     # Create generator
     generator = SyntheticCrowdGenerator(grid_size=(10, 10), zone_area=10)
     
@@ -338,4 +373,8 @@ if __name__ == '__main__':
     scenarios = generator.generate_all_scenarios()
     
     print("\n✅ All scenarios generated successfully!")
-    print("\nNext step: Verify the data quality")
\ No newline at end of file
+    
+    # Verify the in-memory scenarios (no CSV round trip)
+    print()
+    verifier = DataVerifier()
+    verifier.verify_all_scenarios([(name, df) for name, df, _ in scenarios])
\ No newline at end of file
@@ -5,8 +5,9 @@ Checks quality and characteristics of generated data
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Plots are only saved, never shown
 import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 
 
@@ -134,10 +135,15 @@ class DataVerifier:
         for idx, (name, df) in enumerate(scenarios_data):
             ax = axes[idx]
             
+            density = df['density'].to_numpy()
+            mean_density = density.mean()
+            
             # Histogram
-            ax.hist(df['density'], bins=50, color='skyblue', edgecolor='black', alpha=0.7)
-            ax.axvline(df['density'].mean(), color='red', linestyle='--', 
-                      linewidth=2, label=f'Mean: {df["density"].mean():.2f}')
+            counts, edges = np.histogram(density, bins=50)
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                  color='skyblue', edgecolor='black', alpha=0.7)
+            ax.axvline(mean_density, color='red', linestyle='--', 
+                      linewidth=2, label=f'Mean: {mean_density:.2f}')
             
             # Threshold lines
             ax.axvline(2, color='green', linestyle=':', alpha=0.5, label='Safe')
@@ -158,7 +164,7 @@ class DataVerifier:
         plt.savefig('results/data_verification/density_distributions.png', dpi=150)
         print("\n✓ Density distribution plot saved to: results/data_verification/density_distributions.png")
         
-        plt.show()
+        plt.close(fig)
     
     def plot_temporal_patterns(self, scenarios_data):
         """Plot how density changes over time"""
@@ -192,21 +198,31 @@ class DataVerifier:
         plt.savefig('results/data_verification/temporal_patterns.png', dpi=150)
         print("✓ Temporal patterns plot saved to: results/data_verification/temporal_patterns.png")
         
-        plt.show()
+        plt.close(fig)
     
-    def verify_all_scenarios(self):
-        """Main verification function"""
+    def verify_all_scenarios(self, scenarios=None):
+        """
+        Main verification function
+        
+        Args:
+            scenarios: Optional list of (name, DataFrame) pairs already in
+                memory, e.g. from SyntheticCrowdGenerator.generate_all_scenarios().
+                When omitted, scenarios are loaded from data_dir.
+        """
         print("=" * 60)
         print("DATA VERIFICATION PROCESS")
         print("=" * 60)
         
-        scenarios = ['normal', 'rush_hour', 'emergency', 'event_end']
+        if scenarios is None:
+            scenario_names = ['normal', 'rush_hour', 'emergency', 'event_end']
+            scenarios = ((name, self.load_scenario(name)) for name in scenario_names)
+        
         scenarios_data = []
         all_passed = True
         
-        for scenario in scenarios:
-            df = self.load_scenario(scenario)
+        for name, df in scenarios:
             if df is not None:
+                scenario = name.lower().replace(' ', '_')
                 scenarios_data.append((scenario.replace('_', ' ').title(), df))
                 self.print_basic_stats(df, scenario)
                 passed = self.verify_data_quality(df, scenario)
@@ -10,31 +10,96 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-from src.alerts.instruction_generator import InstructionGenerator
+from src.alerts.instruction_generator import InstructionGenerator, EXIT_POSITIONS
+from src.visualization.heatmap_visualizer import add_grid_lines, IMSHOW_KW
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-def visualize_exit_regions():
-    """Visualize exit region assignments"""
+
+# Color index of each exit region in the exit map
+_REGION_CODES = {
+    'North': 1,
+    'South': 2,
+    'East': 3,
+    'West': 4,
+    'Central': 5
+}
+
+
+def _nearest_exit_kernel(rows, cols, exit_positions):
+    """
+    Find the nearest exit (Manhattan distance) for every zone
+    
+    Args:
+        rows: Grid rows
+        cols: Grid columns
+        exit_positions: (n_exits, 2) integer array of exit coordinates,
+            ordered by exit name so ties resolve like get_nearest_exits
+        
+    Returns:
+        (rows, cols) uint8 array of indices into exit_positions
+    """
+    nearest = np.zeros((rows, cols), dtype=np.uint8)
+    
+    for i in range(rows):
+        for j in range(cols):
+            best = abs(i - exit_positions[0, 0]) + abs(j - exit_positions[0, 1])
+            for k in range(1, exit_positions.shape[0]):
+                dist = abs(i - exit_positions[k, 0]) + abs(j - exit_positions[k, 1])
+                if dist < best:
+                    best = dist
+                    nearest[i, j] = k
+    
+    return nearest
+
+
+if NUMBA_AVAILABLE:
+    _nearest_exit_kernel = njit(cache=True)(_nearest_exit_kernel)
+
+
+def _build_exit_grids():
+    """
+    Encode the static exit layout as grids
     
+    Returns:
+        Tuple of (region code grid, nearest exit name grid)
+    """
     generator = InstructionGenerator()
     
-    # Create figure
-    fig, ax = plt.subplots(figsize=(12, 11))
+    region_grid = np.zeros((10, 10), dtype=np.uint8)
+    for region, zones in generator.exit_map.items():
+        for (x, y) in zones:
+            region_grid[x, y] = _REGION_CODES[region]
     
-    # Create grid
-    grid = np.zeros((10, 10))
+    exit_names = sorted(EXIT_POSITIONS)
+    exit_positions = np.array([EXIT_POSITIONS[name] for name in exit_names], dtype=np.int64)
+    nearest_exit_grid = np.array(exit_names)[_nearest_exit_kernel(10, 10, exit_positions)]
     
-    # Color mapping
-    region_colors = {
-        'North': 1,
-        'South': 2,
-        'East': 3,
-        'West': 4,
-        'Central': 5
-    }
+    return region_grid, nearest_exit_grid
+
+
+# The exit layout never changes, so encode it once at import
+_EXIT_REGION_GRID, _NEAREST_EXIT_GRID = _build_exit_grids()
+
+
+def visualize_exit_regions(show_labels: bool = True):
+    """
+    Visualize exit region assignments
+    
+    Args:
+        show_labels: Whether to write zone IDs and nearest exits in each cell
+            (200 text artists; disable for faster rendering)
+    """
+    
+    # Create figure
+    fig, ax = plt.subplots(figsize=(12, 11))
     
     colors_hex = {
         'North': '#FFB6C1',    # Light pink
@@ -44,11 +109,6 @@ def visualize_exit_regions():
         'Central': '#DDA0DD'   # Plum
     }
     
-    # Fill grid with region colors
-    for region, zones in generator.exit_map.items():
-        for (x, y) in zones:
-            grid[x, y] = region_colors[region]
-    
     # Create custom colormap
     from matplotlib.colors import ListedColormap
     cmap = ListedColormap([
@@ -60,36 +120,25 @@ def visualize_exit_regions():
     ])
     
     # Plot
-    im = ax.imshow(grid, cmap=cmap, vmin=1, vmax=5, interpolation='nearest')
+    im = ax.imshow(_EXIT_REGION_GRID, cmap=cmap, vmin=1, vmax=5, **IMSHOW_KW)
     
     # Add grid lines
-    for i in range(11):
-        ax.axhline(i - 0.5, color='white', linewidth=2)
-        ax.axvline(i - 0.5, color='white', linewidth=2)
+    add_grid_lines(ax, 10, 10, colors='white', linewidths=2)
     
     # Add zone labels
-    for i in range(10):
-        for j in range(10):
-            region = generator.get_zone_region(i, j)
-            exits = generator.get_nearest_exits(i, j, max_exits=1)
-            
-            # Zone ID
-            ax.text(j, i, f'({i},{j})', 
-                   ha='center', va='center', fontsize=7, fontweight='bold')
-            
-            # Nearest exit
-            ax.text(j, i + 0.3, exits[0], 
-                   ha='center', va='center', fontsize=6, style='italic', color='darkblue')
+    if show_labels:
+        for i in range(10):
+            for j in range(10):
+                # Zone ID
+                ax.text(j, i, f'({i},{j})', 
+                       ha='center', va='center', fontsize=7, fontweight='bold')
+                
+                # Nearest exit
+                ax.text(j, i + 0.3, _NEAREST_EXIT_GRID[i, j], 
+                       ha='center', va='center', fontsize=6, style='italic', color='darkblue')
     
     # Add exit markers
-    exit_positions = {
-        'North': (0, 5),
-        'South': (9, 5),
-        'East': (5, 9),
-        'West': (5, 0)
-    }
-    
-    for exit_name, (ex, ey) in exit_positions.items():
+    for exit_name, (ex, ey) in EXIT_POSITIONS.items():
         ax.plot(ey, ex, marker='*', markersize=20, color='red', 
                markeredgecolor='black', markeredgewidth=2)
         ax.text(ey, ex - 0.6, f'{exit_name}\nExit', 
@@ -107,8 +156,9 @@ def visualize_exit_regions():
                   markeredgecolor='black', label='Exit Location')
     ]
     
-    ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.02, 1), 
-             fontsize=10, frameon=True, fancybox=True, shadow=True)
+    legend = ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.02, 1), 
+                       fontsize=10, frameon=True, fancybox=True, shadow=True)
+    legend.set_in_layout(False)
     
     # Labels
     ax.set_xlabel('Column', fontsize=12, fontweight='bold')
@@ -120,12 +170,14 @@ def visualize_exit_regions():
     ax.set_xticks(range(10))
     ax.set_yticks(range(10))
     
-    plt.tight_layout()
+    # Fixed margins with room for the legend (the figure is saved untrimmed)
+    fig.subplots_adjust(left=0.06, right=0.74, bottom=0.08, top=0.88)
     
     # Save
     os.makedirs('results/exit_maps', exist_ok=True)
     output_path = 'results/exit_maps/exit_region_map.png'
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    fig.savefig(output_path, dpi=150,
+                pil_kwargs={'compress_level': 3, 'optimize': False})
     print(f"✓ Exit map saved: {output_path}")
     
     return fig
@@ -167,12 +219,10 @@ def visualize_instruction_example():
     cmap = plt.matplotlib.colors.ListedColormap(colors)
     
     # Plot
-    im = ax.imshow(grid, cmap=cmap, vmin=0, vmax=4, interpolation='nearest')
+    im = ax.imshow(grid, cmap=cmap, vmin=0, vmax=4, **IMSHOW_KW)
     
     # Grid lines
-    for i in range(11):
-        ax.axhline(i - 0.5, color='gray', linewidth=1, alpha=0.5)
-        ax.axvline(i - 0.5, color='gray', linewidth=1, alpha=0.5)
+    add_grid_lines(ax, 10, 10, colors='gray', linewidths=1, alpha=0.5)
     
     # Add zone labels and instructions
     for zone in example_zones:
@@ -233,7 +283,8 @@ def visualize_instruction_example():
     
     # Save
     output_path = 'results/exit_maps/instruction_example.png'
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    fig.savefig(output_path, dpi=150,
+                pil_kwargs={'compress_level': 3, 'optimize': False})
     print(f"✓ Instruction example saved: {output_path}")
     
     return fig
@@ -5,11 +5,43 @@ Creates density and classification heatmaps for crowd monitoring
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.colors import LinearSegmentedColormap, ListedColormap
-import seaborn as sns
+from matplotlib.collections import LineCollection
+from matplotlib.colors import ListedColormap, Normalize
 import numpy as np
+import pandas as pd
 from typing import Optional, Tuple, Dict
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# imshow options for small cell grids: draw source pixels without resampling
+IMSHOW_KW = dict(interpolation='none', resample=False, filternorm=False)
+
+
+def add_grid_lines(ax, rows: int, cols: int, **line_kwargs) -> LineCollection:
+    """
+    Draw cell borders for a rows x cols image as a single artist
+    
+    Args:
+        ax: Axes holding an imshow grid (cells centred on integers)
+        rows: Number of grid rows
+        cols: Number of grid columns
+        **line_kwargs: LineCollection styling (colors, linewidths, alpha)
+        
+    Returns:
+        The added LineCollection
+    """
+    xs = np.arange(cols + 1) - 0.5
+    ys = np.arange(rows + 1) - 0.5
+    
+    # Vertical then horizontal segments spanning the whole grid
+    segments = [[(x, ys[0]), (x, ys[-1])] for x in xs]
+    segments += [[(xs[0], y), (xs[-1], y)] for y in ys]
+    
+    lines = LineCollection(segments, zorder=2, **line_kwargs)
+    ax.add_collection(lines, autolim=False)
+    
+    return lines
 
 
 class HeatmapVisualizer:
@@ -35,6 +67,24 @@ class HeatmapVisualizer:
         self.density_vmin = 0
         self.density_vmax = 8
         
+        # Colormaps and norms are shared by every figure this instance draws
+        self._density_cmap = plt.get_cmap(self.density_colormap)
+        self._density_norm = Normalize(vmin=self.density_vmin, vmax=self.density_vmax)
+        self._class_cmap = ListedColormap(list(self.classification_colors.values()))
+        self._class_norm = Normalize(vmin=0, vmax=4)
+        
+        # Level encoding for classification grids
+        self._level_codes = {'safe': 0, 'moderate': 1, 'warning': 2, 'critical': 3, 'emergency': 4}
+        self._level_lut = np.array(list(self._level_codes.values()), dtype=np.uint8)
+        
+        # Persistent figure state for per-frame updates (see setup())
+        self._frame_kind = None
+        self._fig = None
+        self._ax = None
+        self._im = None
+        self._texts = []
+        self._background = None
+        
     def _define_classification_colors(self) -> Dict:
         """
         Define colors for each classification level
@@ -50,6 +100,67 @@ class HeatmapVisualizer:
             'emergency': '#FF0000'    # Red
         }
     
+    def _encode_levels(self, levels) -> np.ndarray:
+        """
+        Convert classification level names to integer codes
+        
+        Args:
+            levels: Sequence of level names
+            
+        Returns:
+            Array of level codes (0 = safe ... 4 = emergency)
+        """
+        codes = pd.Categorical(levels, categories=list(self._level_codes)).codes
+        
+        if (codes < 0).any():
+            unknown = sorted(set(np.asarray(levels)[codes < 0]))
+            raise KeyError(f"Unknown classification level(s): {unknown}")
+        
+        return self._level_lut[codes]
+    
+    def prepare_zones(self, zones) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract zone coordinates, level codes and severities as arrays
+        
+        Callers drawing several figures for the same frame can prepare
+        once and pass the tuple to any method taking classified_zones.
+        
+        Args:
+            zones: DataFrame with classification results, or a tuple
+                previously returned by prepare_zones (returned unchanged)
+            
+        Returns:
+            Tuple of (xs, ys, level_codes, severities) arrays
+        """
+        if isinstance(zones, tuple):
+            return zones
+        
+        xs = zones['x'].to_numpy(dtype=np.intp)
+        ys = zones['y'].to_numpy(dtype=np.intp)
+        level_codes = self._encode_levels(zones['level'])
+        severities = zones['severity'].to_numpy(dtype=float)
+        
+        return xs, ys, level_codes, severities
+    
+    def _zone_grids(self, zones) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lay out classification results on the zone grid
+        
+        Args:
+            zones: DataFrame with classification results or prepare_zones() tuple
+            
+        Returns:
+            Tuple of (level code grid, severity grid)
+        """
+        xs, ys, level_codes, severities = self.prepare_zones(zones)
+        
+        class_grid = np.zeros((self.grid_rows, self.grid_cols))
+        severity_grid = np.zeros((self.grid_rows, self.grid_cols))
+        class_grid[xs, ys] = level_codes
+        severity_grid[xs, ys] = severities
+        
+        return class_grid, severity_grid
+    
     def create_density_heatmap(self, 
                               density_grid: np.ndarray,
                               title: str = "Crowd Density Heatmap",
@@ -70,33 +181,22 @@ class HeatmapVisualizer:
         fig, ax = plt.subplots(figsize=figsize)
         
         # Create heatmap
-        im = sns.heatmap(
-            density_grid,
-            annot=show_values,
-            fmt='.1f',
-            cmap=self.density_colormap,
-            vmin=self.density_vmin,
-            vmax=self.density_vmax,
-            cbar_kws={'label': 'Density (people/m²)', 'shrink': 0.8},
-            linewidths=0.5,
-            linecolor='gray',
-            square=True,
-            ax=ax
-        )
+        self._draw_density_grid(fig, ax, density_grid, show_values,
+                                cbar_kws={'label': 'Density (people/m²)', 'shrink': 0.8})
         
         # Customize plot
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         ax.set_xlabel('Zone Column', fontsize=13, fontweight='bold')
         ax.set_ylabel('Zone Row', fontsize=13, fontweight='bold')
         
-        # Add tick labels
-        ax.set_xticklabels(range(self.grid_cols), fontsize=10)
-        ax.set_yticklabels(range(self.grid_rows), fontsize=10)
+        # Tick labels come from the default formatter; only size them
+        ax.tick_params(labelsize=10)
         
         # Add density threshold lines (optional visual guides)
         self._add_threshold_annotations(ax)
         
-        plt.tight_layout()
+        # Keep the threshold note (below the x label) inside the figure
+        plt.tight_layout(rect=(0, 0.04, 1, 1))
         
         return fig
     
@@ -104,14 +204,17 @@ class HeatmapVisualizer:
                                      classified_zones,
                                      title: str = "Zone Classification Map",
                                      show_severity: bool = True,
+                                     max_labels: Optional[int] = None,
                                      figsize: Tuple[int, int] = (12, 10)) -> plt.Figure:
         """
         Create classification heatmap with discrete color levels
         
         Args:
-            classified_zones: DataFrame with classification results
+            classified_zones: DataFrame with classification results, or the
+                tuple from prepare_zones()
             title: Plot title
             show_severity: Whether to show severity scores in cells
+            max_labels: Only label the N most severe cells (None labels all)
             figsize: Figure size
             
         Returns:
@@ -120,56 +223,33 @@ class HeatmapVisualizer:
         fig, ax = plt.subplots(figsize=figsize)
         
         # Create classification grid
-        class_grid = np.zeros((self.grid_rows, self.grid_cols))
-        severity_grid = np.zeros((self.grid_rows, self.grid_cols))
-        
-        level_map = {
-            'safe': 0,
-            'moderate': 1,
-            'warning': 2,
-            'critical': 3,
-            'emergency': 4
-        }
-        
-        for _, zone in classified_zones.iterrows():
-            x, y = int(zone['x']), int(zone['y'])
-            class_grid[x, y] = level_map[zone['level']]
-            severity_grid[x, y] = zone['severity']
-        
-        # Create custom colormap
-        colors = [
-            self.classification_colors['safe'],
-            self.classification_colors['moderate'],
-            self.classification_colors['warning'],
-            self.classification_colors['critical'],
-            self.classification_colors['emergency']
-        ]
-        cmap = ListedColormap(colors)
+        class_grid, severity_grid = self._zone_grids(classified_zones)
         
         # Plot classification
-        im = ax.imshow(class_grid, cmap=cmap, vmin=0, vmax=4, 
-                      interpolation='nearest', aspect='equal')
+        ax.imshow(class_grid, cmap=self._class_cmap, norm=self._class_norm,
+                 aspect='equal', **IMSHOW_KW)
         
         # Add grid lines
-        for i in range(self.grid_rows + 1):
-            ax.axhline(i - 0.5, color='white', linewidth=2)
-        for j in range(self.grid_cols + 1):
-            ax.axvline(j - 0.5, color='white', linewidth=2)
+        add_grid_lines(ax, self.grid_rows, self.grid_cols, colors='white', linewidths=2)
         
         # Annotate with severity scores
         if show_severity:
-            for i in range(self.grid_rows):
-                for j in range(self.grid_cols):
-                    severity = severity_grid[i, j]
-                    level = int(class_grid[i, j])
-                    
-                    # Choose text color for readability
-                    text_color = 'black' if level < 3 else 'white'
-                    
-                    ax.text(j, i, f'{severity:.0f}', 
-                           ha='center', va='center',
-                           fontsize=9, fontweight='bold',
-                           color=text_color)
+            if max_labels is not None:
+                # Each label is a separate Text artist, so only keep the extremes
+                order = np.argsort(severity_grid, axis=None, kind='stable')[::-1][:max_labels]
+                cells = zip(*np.unravel_index(order, severity_grid.shape))
+            else:
+                cells = np.ndindex(severity_grid.shape)
+            
+            # Labels and text colors (dark text on light levels) for all cells
+            labels = np.char.mod('%.0f', severity_grid)
+            text_colors = np.where(class_grid < 3, 'black', 'white')
+            
+            for i, j in cells:
+                ax.text(j, i, labels[i, j], 
+                       ha='center', va='center',
+                       fontsize=9, fontweight='bold',
+                       color=text_colors[i, j])
         
         # Create legend
         legend_elements = [
@@ -185,9 +265,10 @@ class HeatmapVisualizer:
                           edgecolor='black', label='Emergency (7+ people/m²)')
         ]
         
-        ax.legend(handles=legend_elements, loc='upper left', 
-                 bbox_to_anchor=(1.02, 1), fontsize=10,
-                 title='Classification Levels', title_fontsize=11)
+        legend = ax.legend(handles=legend_elements, loc='upper left', 
+                          bbox_to_anchor=(1.02, 1), fontsize=10,
+                          title='Classification Levels', title_fontsize=11)
+        legend.set_in_layout(False)
         
         # Customize plot
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
@@ -197,10 +278,10 @@ class HeatmapVisualizer:
         # Set ticks
         ax.set_xticks(range(self.grid_cols))
         ax.set_yticks(range(self.grid_rows))
-        ax.set_xticklabels(range(self.grid_cols), fontsize=10)
-        ax.set_yticklabels(range(self.grid_rows), fontsize=10)
+        ax.tick_params(labelsize=10)
         
-        plt.tight_layout()
+        # Reserve the right margin for the legend (figures are saved untrimmed)
+        plt.tight_layout(rect=(0, 0, 0.8, 1))
         
         return fig
     
@@ -208,14 +289,17 @@ class HeatmapVisualizer:
                            density_grid: np.ndarray,
                            classified_zones,
                            title: str = "Crowd Analysis - Density & Classification",
+                           show_values: bool = True,
                            figsize: Tuple[int, int] = (20, 9)) -> plt.Figure:
         """
         Create side-by-side density and classification heatmaps
         
         Args:
             density_grid: 2D array of density values
-            classified_zones: DataFrame with classification results
+            classified_zones: DataFrame with classification results, or the
+                tuple from prepare_zones()
             title: Overall title
+            show_values: Whether to annotate density cells with values
             figsize: Figure size
             
         Returns:
@@ -224,43 +308,21 @@ class HeatmapVisualizer:
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
         
         # Left: Density Heatmap
-        sns.heatmap(
-            density_grid,
-            annot=True,
-            fmt='.1f',
-            cmap=self.density_colormap,
-            vmin=self.density_vmin,
-            vmax=self.density_vmax,
-            cbar_kws={'label': 'Density (people/m²)'},
-            linewidths=0.5,
-            linecolor='gray',
-            square=True,
-            ax=ax1
-        )
+        self._draw_density_grid(fig, ax1, density_grid, show_values,
+                                cbar_kws={'label': 'Density (people/m²)'})
         
         ax1.set_title('Density Distribution', fontsize=14, fontweight='bold')
         ax1.set_xlabel('Column', fontsize=11)
         ax1.set_ylabel('Row', fontsize=11)
         
         # Right: Classification Heatmap
-        class_grid = np.zeros((self.grid_rows, self.grid_cols))
-        level_map = {'safe': 0, 'moderate': 1, 'warning': 2, 'critical': 3, 'emergency': 4}
-        
-        for _, zone in classified_zones.iterrows():
-            x, y = int(zone['x']), int(zone['y'])
-            class_grid[x, y] = level_map[zone['level']]
+        class_grid, _ = self._zone_grids(classified_zones)
         
-        colors = list(self.classification_colors.values())
-        cmap = ListedColormap(colors)
-        
-        im = ax2.imshow(class_grid, cmap=cmap, vmin=0, vmax=4, 
-                       interpolation='nearest', aspect='equal')
+        ax2.imshow(class_grid, cmap=self._class_cmap, norm=self._class_norm,
+                  aspect='equal', **IMSHOW_KW)
         
         # Grid lines
-        for i in range(self.grid_rows + 1):
-            ax2.axhline(i - 0.5, color='white', linewidth=1.5)
-        for j in range(self.grid_cols + 1):
-            ax2.axvline(j - 0.5, color='white', linewidth=1.5)
+        add_grid_lines(ax2, self.grid_rows, self.grid_cols, colors='white', linewidths=1.5)
         
         ax2.set_title('Classification Map', fontsize=14, fontweight='bold')
         ax2.set_xlabel('Column', fontsize=11)
@@ -304,7 +366,8 @@ class HeatmapVisualizer:
         
         Args:
             density_grid: 2D array of density values
-            classified_zones: DataFrame with classification results
+            classified_zones: DataFrame with classification results, or the
+                tuple from prepare_zones()
             alerts: List of active alerts
             title: Plot title
             figsize: Figure size
@@ -315,47 +378,31 @@ class HeatmapVisualizer:
         fig, ax = plt.subplots(figsize=figsize)
         
         # Create classification grid
-        class_grid = np.zeros((self.grid_rows, self.grid_cols))
-        level_map = {'safe': 0, 'moderate': 1, 'warning': 2, 'critical': 3, 'emergency': 4}
-        
-        for _, zone in classified_zones.iterrows():
-            x, y = int(zone['x']), int(zone['y'])
-            class_grid[x, y] = level_map[zone['level']]
+        class_grid, _ = self._zone_grids(classified_zones)
         
         # Plot
-        colors = list(self.classification_colors.values())
-        cmap = ListedColormap(colors)
-        
-        im = ax.imshow(class_grid, cmap=cmap, vmin=0, vmax=4, 
-                      interpolation='nearest', aspect='equal')
+        ax.imshow(class_grid, cmap=self._class_cmap, norm=self._class_norm,
+                 aspect='equal', **IMSHOW_KW)
         
         # Grid lines
-        for i in range(self.grid_rows + 1):
-            ax.axhline(i - 0.5, color='white', linewidth=2)
-        for j in range(self.grid_cols + 1):
-            ax.axvline(j - 0.5, color='white', linewidth=2)
+        add_grid_lines(ax, self.grid_rows, self.grid_cols, colors='white', linewidths=2)
         
         # Annotate with density and alert icons
-        alert_zones = {alert['zone_id']: alert for alert in alerts}
+        icon_grid, alert_mask = self._alert_icon_grid(alerts)
+        text_colors = np.where(class_grid < 3, 'black', 'white')
+        density_labels = np.char.mod('%.1f', density_grid)
         
         for i in range(self.grid_rows):
             for j in range(self.grid_cols):
-                zone_id = f"Zone_{i}_{j}"
-                density = density_grid[i, j]
-                level = int(class_grid[i, j])
-                
                 # Density value
-                text_color = 'black' if level < 3 else 'white'
-                ax.text(j, i - 0.2, f'{density:.1f}', 
+                ax.text(j, i - 0.2, density_labels[i, j], 
                        ha='center', va='center',
                        fontsize=8, fontweight='bold',
-                       color=text_color)
+                       color=text_colors[i, j])
                 
                 # Alert icon if present
-                if zone_id in alert_zones:
-                    alert = alert_zones[zone_id]
-                    icon = alert['visual']['icon']
-                    ax.text(j, i + 0.2, icon, 
+                if alert_mask[i, j]:
+                    ax.text(j, i + 0.2, icon_grid[i, j], 
                            ha='center', va='center',
                            fontsize=14)
         
@@ -396,6 +443,243 @@ class HeatmapVisualizer:
         
         return fig
     
+    def _alert_icon_grid(self, alerts) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lay out alert icons on the zone grid
+        
+        Args:
+            alerts: List of alert dictionaries (zone IDs like 'Zone_3_7')
+            
+        Returns:
+            Tuple of (icon grid, boolean mask of zones with an alert)
+        """
+        icon_grid = np.full((self.grid_rows, self.grid_cols), '', dtype=object)
+        alert_mask = np.zeros((self.grid_rows, self.grid_cols), dtype=bool)
+        
+        # Later alerts for the same zone replace earlier ones
+        for alert in alerts:
+            # Skip alerts whose zone ID is not a 'Zone_<row>_<col>' grid cell
+            try:
+                _, x, y = alert['zone_id'].split('_')
+                x, y = int(x), int(y)
+            except (ValueError, AttributeError):
+                continue
+            if 0 <= x < self.grid_rows and 0 <= y < self.grid_cols:
+                icon_grid[x, y] = alert['visual']['icon']
+                alert_mask[x, y] = True
+        
+        return icon_grid, alert_mask
+    
+    def setup(self,
+              kind: str = 'density',
+              title: Optional[str] = None,
+              show_values: bool = True,
+              figsize: Tuple[int, int] = (12, 10)) -> plt.Figure:
+        """
+        Build a reusable figure for rendering many frames
+        
+        The figure, image and cell labels are created once; each frame
+        then only updates their data via update_density() or
+        update_classification() and blits the axes region.
+        
+        Args:
+            kind: 'density' or 'classification'
+            title: Plot title
+            show_values: Whether to annotate cells with values
+            figsize: Figure size
+            
+        Returns:
+            Matplotlib figure
+        """
+        if kind not in ('density', 'classification'):
+            raise ValueError(f"Unknown heatmap kind: {kind}")
+        
+        # Release the figure from a previous setup() so repeated calls don't pile up
+        if self._fig is not None:
+            plt.close(self._fig)
+        
+        fig, ax = plt.subplots(figsize=figsize)
+        empty_grid = np.zeros((self.grid_rows, self.grid_cols))
+        
+        if kind == 'density':
+            im = ax.imshow(empty_grid, cmap=self._density_cmap, norm=self._density_norm,
+                          aspect='equal', **IMSHOW_KW)
+            fig.colorbar(im, ax=ax, label='Density (people/m²)', shrink=0.8)
+            default_title = "Crowd Density Heatmap"
+        else:
+            im = ax.imshow(empty_grid, cmap=self._class_cmap, norm=self._class_norm,
+                          aspect='equal', **IMSHOW_KW)
+            default_title = "Zone Classification Map"
+        
+        texts = []
+        if show_values:
+            texts = [
+                ax.text(j, i, '', ha='center', va='center',
+                       fontsize=9, fontweight='bold')
+                for i in range(self.grid_rows)
+                for j in range(self.grid_cols)
+            ]
+        
+        ax.set_title(title or default_title, fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('Zone Column', fontsize=13, fontweight='bold')
+        ax.set_ylabel('Zone Row', fontsize=13, fontweight='bold')
+        ax.set_xticks(range(self.grid_cols))
+        ax.set_yticks(range(self.grid_rows))
+        
+        plt.tight_layout()
+        
+        # Capture the static background without the per-frame artists
+        for artist in [im] + texts:
+            artist.set_visible(False)
+        fig.canvas.draw()
+        self._background = fig.canvas.copy_from_bbox(ax.bbox)
+        for artist in [im] + texts:
+            artist.set_visible(True)
+        
+        self._frame_kind = kind
+        self._fig, self._ax, self._im, self._texts = fig, ax, im, texts
+        
+        return fig
+    
+    def update_density(self, density_grid: np.ndarray) -> plt.Figure:
+        """
+        Show a new density grid on the figure built by setup('density')
+        
+        Args:
+            density_grid: 2D array of density values
+            
+        Returns:
+            Matplotlib figure
+        """
+        if self._frame_kind != 'density':
+            raise ValueError("Call setup('density') before update_density()")
+        
+        labels = np.char.mod('%.1f', density_grid).ravel()
+        text_colors = np.where(density_grid < 5, 'black', 'white').ravel()
+        
+        for text, label, color in zip(self._texts, labels, text_colors):
+            text.set_text(label)
+            text.set_color(color)
+        
+        return self._blit_frame(density_grid)
+    
+    def update_classification(self, classified_zones) -> plt.Figure:
+        """
+        Show new classification results on the figure built by
+        setup('classification')
+        
+        Args:
+            classified_zones: DataFrame with classification results, or the
+                tuple from prepare_zones()
+            
+        Returns:
+            Matplotlib figure
+        """
+        if self._frame_kind != 'classification':
+            raise ValueError("Call setup('classification') before update_classification()")
+        
+        class_grid, severity_grid = self._zone_grids(classified_zones)
+        
+        labels = np.char.mod('%.0f', severity_grid).ravel()
+        text_colors = np.where(class_grid < 3, 'black', 'white').ravel()
+        
+        for text, label, color in zip(self._texts, labels, text_colors):
+            text.set_text(label)
+            text.set_color(color)
+        
+        return self._blit_frame(class_grid)
+    
+    def _blit_frame(self, grid: np.ndarray) -> plt.Figure:
+        """Redraw only the per-frame artists over the cached background"""
+        canvas = self._fig.canvas
+        canvas.restore_region(self._background)
+        
+        self._im.set_array(grid)
+        self._ax.draw_artist(self._im)
+        for text in self._texts:
+            self._ax.draw_artist(text)
+        
+        canvas.blit(self._ax.bbox)
+        
+        return self._fig
+    
+    def animate_density(self,
+                        density_grids,
+                        filepath: str,
+                        title: str = "Crowd Density Over Time",
+                        show_values: bool = True,
+                        fps: int = 5,
+                        figsize: Tuple[int, int] = (12, 10)) -> str:
+        """
+        Render a sequence of density grids to an animated GIF
+        
+        Axes, title and colorbar are drawn once; each frame only blits
+        the image and cell labels over the cached background.
+        
+        Args:
+            density_grids: Iterable of 2D density arrays, one per frame
+            filepath: Output GIF path
+            title: Plot title
+            show_values: Whether to annotate cells with values
+            fps: Frames per second
+            figsize: Figure size
+            
+        Returns:
+            Output file path
+        """
+        from PIL import Image
+        
+        fig = self.setup('density', title=title, show_values=show_values, figsize=figsize)
+        
+        frames = []
+        for density_grid in density_grids:
+            self.update_density(density_grid)
+            rgba = np.asarray(fig.canvas.buffer_rgba())
+            frames.append(Image.fromarray(rgba[..., :3].copy()))
+        
+        plt.close(fig)
+        
+        if not frames:
+            raise ValueError("No density grids to animate")
+        
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        frames[0].save(filepath, save_all=True, append_images=frames[1:],
+                       duration=int(1000 / fps), loop=0)
+        print(f"✓ Animation saved: {filepath} ({len(frames)} frames)")
+        
+        return filepath
+    
+    def _draw_density_grid(self, fig, ax, density_grid: np.ndarray,
+                           show_values: bool, cbar_kws: Dict):
+        """
+        Draw a density grid with optional per-cell value labels
+        
+        Args:
+            fig: Matplotlib figure (owns the colorbar)
+            ax: Axes to draw into
+            density_grid: 2D array of density values
+            show_values: Whether to annotate cells with values
+            cbar_kws: Keyword arguments for the colorbar
+        """
+        im = ax.imshow(density_grid, cmap=self._density_cmap, norm=self._density_norm,
+                      aspect='equal', **IMSHOW_KW)
+        fig.colorbar(im, ax=ax, **cbar_kws)
+        
+        # Cell borders
+        add_grid_lines(ax, *density_grid.shape, colors='gray', linewidths=0.5)
+        
+        ax.set_xticks(range(density_grid.shape[1]))
+        ax.set_yticks(range(density_grid.shape[0]))
+        
+        if show_values:
+            # Format all labels in one vectorized call
+            labels = np.char.mod('%.1f', density_grid)
+            for (i, j), label in np.ndenumerate(labels):
+                ax.text(j, i, label, ha='center', va='center', fontsize=10,
+                       color='black' if density_grid[i, j] < 5 else 'white')
+        
+        return im
+    
     def _add_threshold_annotations(self, ax):
         """Add threshold reference annotations to density heatmap"""
         # Add subtle text annotations for thresholds
@@ -407,20 +691,86 @@ class HeatmapVisualizer:
                ha='center', fontsize=9, style='italic',
                bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.5))
     
-    def save_heatmap(self, fig: plt.Figure, filepath: str, dpi: int = 150):
+    def save_heatmap(self, fig: plt.Figure, filepath: str, dpi: int = 150,
+                     compress_level: int = 3, bbox_inches: Optional[str] = None):
         """
         Save heatmap to file
         
+        Figures are laid out with tight_layout() when created, so the
+        extra measuring pass of bbox_inches='tight' is opt-in.
+        
         Args:
             fig: Matplotlib figure
             filepath: Output file path
             dpi: Resolution
+            compress_level: PNG zlib level (0-9); lower is faster to write
+            bbox_inches: Passed to savefig ('tight' to crop to content)
         """
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        fig.savefig(filepath, dpi=dpi, bbox_inches='tight')
+        fig.savefig(filepath, dpi=dpi, bbox_inches=bbox_inches,
+                    pil_kwargs={'compress_level': compress_level, 'optimize': False})
         print(f"✓ Heatmap saved: {filepath}")
 
 
+# Figure kind -> HeatmapVisualizer method, for batch rendering
+_RENDERERS = {
+    'density': 'create_density_heatmap',
+    'classification': 'create_classification_heatmap',
+    'dual': 'create_dual_heatmap',
+    'annotated': 'create_annotated_heatmap'
+}
+
+
+def _render_frame(grid_size: Tuple[int, int], kind: str, path: str,
+                  args: tuple, kwargs: dict) -> str:
+    """
+    Render one heatmap and write it to disk (runs in a worker process)
+    
+    Args:
+        grid_size: Tuple of (rows, cols) for the worker's visualizer
+        kind: Figure kind, one of _RENDERERS
+        path: Output PNG path
+        args: Positional arguments for the create_* method
+        kwargs: Keyword arguments for the create_* method
+        
+    Returns:
+        Output file path
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    
+    visualizer = HeatmapVisualizer(grid_size=grid_size)
+    fig = getattr(visualizer, _RENDERERS[kind])(*args, **kwargs)
+    visualizer.save_heatmap(fig, path)
+    plt.close(fig)
+    
+    return path
+
+
+def render_frames(frames, max_workers: Optional[int] = None,
+                  grid_size: Tuple[int, int] = (10, 10)) -> list:
+    """
+    Render several heatmaps in parallel, one process per figure
+    
+    Each worker builds and saves its own figure, so only the input data
+    crosses the process boundary.
+    
+    Args:
+        frames: Iterable of (kind, path, args, kwargs) tuples
+        max_workers: Process count (defaults to os.cpu_count())
+        grid_size: Tuple of (rows, cols) passed to each worker's
+            HeatmapVisualizer; match the visualizer that prepared the data
+        
+    Returns:
+        List of output file paths, in input order
+    """
+    frames = list(frames)
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        futures = [ex.submit(_render_frame, grid_size, *frame) for frame in frames]
+        return [future.result() for future in futures]
+
+
 # Testing function
 def test_heatmap_visualizer():
     """Test heatmap visualizer with sample data"""
@@ -461,47 +811,30 @@ def test_heatmap_visualizer():
     print("\nInitializing visualizer...")
     visualizer = HeatmapVisualizer()
     
-    # Test 1: Density Heatmap
-    print("\n1. Creating density heatmap...")
-    fig1 = visualizer.create_density_heatmap(
-        density_grid,
-        title="Emergency Scenario - Density Distribution (Frame 75)"
-    )
-    visualizer.save_heatmap(fig1, 'results/heatmaps/test_density_heatmap.png')
-    
-    # Test 2: Classification Heatmap
-    print("\n2. Creating classification heatmap...")
-    fig2 = visualizer.create_classification_heatmap(
-        classified,
-        title="Emergency Scenario - Classification Map (Frame 75)"
-    )
-    visualizer.save_heatmap(fig2, 'results/heatmaps/test_classification_heatmap.png')
-    
-    # Test 3: Dual Heatmap
-    print("\n3. Creating dual heatmap...")
-    fig3 = visualizer.create_dual_heatmap(
-        density_grid,
-        classified,
-        title="Emergency Scenario - Comprehensive Analysis (Frame 75)"
-    )
-    visualizer.save_heatmap(fig3, 'results/heatmaps/test_dual_heatmap.png')
-    
-    # Test 4: Annotated Heatmap
-    print("\n4. Creating annotated heatmap...")
-    fig4 = visualizer.create_annotated_heatmap(
-        density_grid,
-        classified,
-        active_alerts,
-        title="Emergency Scenario - Status with Alerts (Frame 75)"
-    )
-    visualizer.save_heatmap(fig4, 'results/heatmaps/test_annotated_heatmap.png')
+    # Prepare the classification arrays once; all three zone figures reuse it
+    zones = visualizer.prepare_zones(classified)
+    
+    # Figures are independent, so render them in parallel
+    print("\nRendering density, classification, dual and annotated heatmaps...")
+    render_frames([
+        ('density', 'results/heatmaps/test_density_heatmap.png',
+         (density_grid,),
+         {'title': "Emergency Scenario - Density Distribution (Frame 75)"}),
+        ('classification', 'results/heatmaps/test_classification_heatmap.png',
+         (zones,),
+         {'title': "Emergency Scenario - Classification Map (Frame 75)"}),
+        ('dual', 'results/heatmaps/test_dual_heatmap.png',
+         (density_grid, zones),
+         {'title': "Emergency Scenario - Comprehensive Analysis (Frame 75)"}),
+        ('annotated', 'results/heatmaps/test_annotated_heatmap.png',
+         (density_grid, zones, active_alerts),
+         {'title': "Emergency Scenario - Status with Alerts (Frame 75)"})
+    ], grid_size=(visualizer.grid_rows, visualizer.grid_cols))
     
     print("\n" + "=" * 80)
     print("✅ HEATMAP VISUALIZER TEST COMPLETE")
     print("=" * 80)
     print("\nCheck 'results/heatmaps/' for output files")
-    
-    plt.show()
 
 
 if __name__ == '__main__':
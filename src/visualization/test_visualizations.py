@@ -8,33 +8,113 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.data_processor import CrowdDataProcessor
+from utils.parallel import run_scenarios_parallel
+from visualization.heatmap_visualizer import add_grid_lines, IMSHOW_KW
+import matplotlib
+matplotlib.use('Agg')  # headless: figures are only written to disk
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
 
 
-def plot_single_frame_heatmap(processor: CrowdDataProcessor, timestamp: int, scenario_name: str):
-    """Plot density heatmap for a single frame"""
+# Background PNG writer: encoding overlaps rendering of the next figure
+_io_pool = ThreadPoolExecutor(max_workers=2)
+_pending_writes = []
+
+
+def _write_png(path: str, rgba: np.ndarray, dpi: int):
+    """Encode an RGBA buffer and write it to disk (runs on the writer pool)"""
+    from PIL import Image
+    
+    Image.fromarray(rgba).save(path, dpi=(dpi, dpi))
+    
+    # Reported from the task itself, so it is printed before the future completes
+    print(f"✓ Saved: {path}")
+
+
+def save_figure_async(fig, path: str, dpi: int = 100):
+    """
+    Rasterize a figure now and queue its PNG encoding/writing
+    
+    "✓ Saved" is printed once the file is actually written.
+    
+    Args:
+        fig: Matplotlib figure (may be closed as soon as this returns)
+        path: Output PNG path
+        dpi: Output resolution
+        
+    Returns:
+        Future of the write; result() re-raises any write error
+    """
+    fig.set_dpi(dpi)
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba()).copy()
+    
+    future = _io_pool.submit(_write_png, path, rgba, dpi)
+    _pending_writes.append(future)
+    
+    return future
+
+
+def wait_for_writes():
+    """Block until every queued PNG is on disk, re-raising any write error"""
+    done, _ = wait(_pending_writes)
+    _pending_writes.clear()
+    
+    for future in done:
+        future.result()
+
+
+def _make_heatmap_axes(ax, vmin: float, vmax: float, cmap: str, shape: tuple = (10, 10)):
+    """
+    Create the image artist for a zone heatmap once
+    
+    Args:
+        ax: Axes to draw into
+        vmin: Lower bound of the color scale
+        vmax: Upper bound of the color scale
+        cmap: Colormap name
+        shape: Grid shape (rows, cols)
+        
+    Returns:
+        AxesImage; feed it new grids with im.set_data(grid)
+    """
+    rows, cols = shape
+    im = ax.imshow(np.zeros(shape), cmap=cmap, vmin=vmin, vmax=vmax,
+                   aspect='auto', **IMSHOW_KW)
+    
+    # One tick per zone, like a seaborn heatmap
+    ax.set_xticks(np.arange(cols))
+    ax.set_yticks(np.arange(rows))
+    
+    return im
+
+
+def plot_single_frame_heatmap(processor: CrowdDataProcessor, timestamp: int, scenario_name: str,
+                              density_grid: np.ndarray = None):
+    """Plot density heatmap for a single frame (pass density_grid to reuse one)"""
     
     # Get density grid
-    density_grid = processor.create_density_grid(timestamp)
+    if density_grid is None:
+        density_grid = processor.create_density_grid(timestamp)
     
     # Create figure
     fig, ax = plt.subplots(figsize=(10, 9))
     
     # Create heatmap
-    sns.heatmap(
-        density_grid,
-        annot=True,
-        fmt='.1f',
-        cmap='YlOrRd',
-        cbar_kws={'label': 'Density (people/m²)'},
-        vmin=0,
-        vmax=8,
-        linewidths=0.5,
-        linecolor='gray',
-        ax=ax
-    )
+    im = _make_heatmap_axes(ax, 0, 8, 'YlOrRd', density_grid.shape)
+    im.set_data(density_grid)
+    fig.colorbar(im, ax=ax, label='Density (people/m²)')
+    
+    # Cell borders
+    add_grid_lines(ax, *density_grid.shape, colors='gray', linewidths=0.5)
+    
+    # Value labels
+    for (i, j), value in np.ndenumerate(density_grid):
+        if value < 0.05:
+            continue  # would print as 0.0; empty cells need no label
+        ax.text(j, i, f'{value:.1f}', ha='center', va='center', fontsize=9,
+                color='black' if value < 5 else 'white')
     
     ax.set_title(f'{scenario_name.title()} Scenario - Frame {timestamp}\nCrowd Density Heatmap', 
                  fontsize=14, fontweight='bold', pad=15)
@@ -46,20 +126,43 @@ def plot_single_frame_heatmap(processor: CrowdDataProcessor, timestamp: int, sce
     # Save
     os.makedirs('results/test_visualizations', exist_ok=True)
     output_path = f'results/test_visualizations/{scenario_name}_frame_{timestamp}_heatmap.png'
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    print(f"✓ Saved: {output_path}")
+    future = save_figure_async(fig, output_path)
+    plt.close(fig)
     
-    return fig
+    return future
+
+
+# Temporal evolution figure, built once and redrawn for every zone/scenario
+_temporal_fig = None
+_temporal_axes_list = None
+
+
+def _temporal_axes():
+    """
+    Get the shared 3-row temporal evolution figure with cleared axes
+    
+    Returns:
+        Tuple of (figure, axes array)
+    """
+    global _temporal_fig, _temporal_axes_list
+    
+    if _temporal_fig is None:
+        _temporal_fig, _temporal_axes_list = plt.subplots(3, 1, figsize=(12, 10))
+    else:
+        for ax in _temporal_axes_list:
+            ax.cla()
+    
+    return _temporal_fig, _temporal_axes_list
 
 
 def plot_temporal_evolution(processor: CrowdDataProcessor, x: int, y: int, scenario_name: str):
-    """Plot how a specific zone evolves over time"""
+    """Plot how a specific zone evolves over time on the shared figure; returns the write future"""
     
     # Get temporal profile
     temporal_data = processor.get_temporal_profile(x, y)
     
-    # Create figure with subplots
-    fig, axes = plt.subplots(3, 1, figsize=(12, 10))
+    # Reuse the shared 3-row figure
+    fig, axes = _temporal_axes()
     
     # Plot density over time
     axes[0].plot(temporal_data['timestamp'], temporal_data['density'], 
@@ -92,18 +195,18 @@ def plot_temporal_evolution(processor: CrowdDataProcessor, x: int, y: int, scena
     axes[2].set_xlabel('Timestamp', fontsize=11)
     axes[2].grid(alpha=0.3)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save
     output_path = f'results/test_visualizations/{scenario_name}_zone_{x}_{y}_temporal.png'
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    print(f"✓ Saved: {output_path}")
-    
-    return fig
+    return save_figure_async(fig, output_path)
 
 
-def plot_comparison_frames(processor: CrowdDataProcessor, timestamps: list, scenario_name: str):
-    """Plot multiple frames side by side"""
+def plot_comparison_frames(processor: CrowdDataProcessor, timestamps: list, scenario_name: str,
+                           density_grids: dict = None):
+    """Plot multiple frames side by side (density_grids maps timestamp -> grid)"""
+    
+    density_grids = density_grids or {}
     
     n_frames = len(timestamps)
     fig, axes = plt.subplots(1, n_frames, figsize=(6*n_frames, 5))
@@ -111,48 +214,54 @@ def plot_comparison_frames(processor: CrowdDataProcessor, timestamps: list, scen
     if n_frames == 1:
         axes = [axes]
     
+    # Build every panel's image up front, then just swap in each frame's grid
+    images = [_make_heatmap_axes(ax, 0, 8, 'YlOrRd') for ax in axes]
+    
     for idx, ts in enumerate(timestamps):
-        density_grid = processor.create_density_grid(ts)
+        density_grid = density_grids.get(ts)
+        if density_grid is None:
+            density_grid = processor.create_density_grid(ts)
         
-        sns.heatmap(
-            density_grid,
-            annot=False,
-            cmap='YlOrRd',
-            vmin=0,
-            vmax=8,
-            cbar=True if idx == n_frames-1 else False,
-            cbar_kws={'label': 'Density (people/m²)'},
-            ax=axes[idx]
-        )
+        images[idx].set_data(density_grid)
         
         axes[idx].set_title(f'Frame {ts}', fontsize=12, fontweight='bold')
         axes[idx].set_xlabel('Column')
         axes[idx].set_ylabel('Row')
     
+    fig.colorbar(images[-1], ax=axes[-1], label='Density (people/m²)')
+    
     fig.suptitle(f'{scenario_name.title()} Scenario - Temporal Comparison', 
-                fontsize=14, fontweight='bold', y=1.02)
+                fontsize=14, fontweight='bold')
     
     plt.tight_layout()
     
     # Save
     output_path = f'results/test_visualizations/{scenario_name}_comparison.png'
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    print(f"✓ Saved: {output_path}")
+    future = save_figure_async(fig, output_path)
+    plt.close(fig)
     
-    return fig
+    return future
 
 
-def plot_spatial_statistics(processor: CrowdDataProcessor, timestamp: int, scenario_name: str):
-    """Plot spatial statistics for a given timestamp"""
+def plot_spatial_statistics(processor: CrowdDataProcessor, timestamp: int, scenario_name: str,
+                            frame=None):
+    """Plot spatial statistics for a given timestamp (pass frame to reuse one)"""
     
-    frame = processor.get_frame(timestamp)
+    if frame is None:
+        frame = processor.get_frame(timestamp)
+    
+    # Pull the columns out of pandas once and reduce each a single time
+    density = frame['density'].to_numpy()
+    speed = frame['movement_speed'].to_numpy()
+    dvar = frame['direction_variance'].to_numpy()
+    d_mean, s_mean, v_mean = density.mean(), speed.mean(), dvar.mean()
     
     fig, axes = plt.subplots(2, 2, figsize=(14, 12))
     
     # Density histogram
-    axes[0, 0].hist(frame['density'], bins=30, color='skyblue', edgecolor='black')
-    axes[0, 0].axvline(frame['density'].mean(), color='red', linestyle='--', 
-                      linewidth=2, label=f'Mean: {frame["density"].mean():.2f}')
+    axes[0, 0].hist(density, bins=30, color='skyblue', edgecolor='black')
+    axes[0, 0].axvline(d_mean, color='red', linestyle='--', 
+                      linewidth=2, label=f'Mean: {d_mean:.2f}')
     axes[0, 0].set_xlabel('Density (people/m²)')
     axes[0, 0].set_ylabel('Frequency')
     axes[0, 0].set_title('Density Distribution')
@@ -160,9 +269,9 @@ def plot_spatial_statistics(processor: CrowdDataProcessor, timestamp: int, scena
     axes[0, 0].grid(alpha=0.3)
     
     # Speed histogram
-    axes[0, 1].hist(frame['movement_speed'], bins=30, color='lightgreen', edgecolor='black')
-    axes[0, 1].axvline(frame['movement_speed'].mean(), color='red', linestyle='--', 
-                      linewidth=2, label=f'Mean: {frame["movement_speed"].mean():.2f}')
+    axes[0, 1].hist(speed, bins=30, color='lightgreen', edgecolor='black')
+    axes[0, 1].axvline(s_mean, color='red', linestyle='--', 
+                      linewidth=2, label=f'Mean: {s_mean:.2f}')
     axes[0, 1].set_xlabel('Movement Speed (m/s)')
     axes[0, 1].set_ylabel('Frequency')
     axes[0, 1].set_title('Speed Distribution')
@@ -170,17 +279,17 @@ def plot_spatial_statistics(processor: CrowdDataProcessor, timestamp: int, scena
     axes[0, 1].grid(alpha=0.3)
     
     # Density vs Speed scatter
-    axes[1, 0].scatter(frame['density'], frame['movement_speed'], 
-                      alpha=0.6, c=frame['density'], cmap='YlOrRd')
+    axes[1, 0].scatter(density, speed, 
+                      alpha=0.6, c=density, cmap='YlOrRd')
     axes[1, 0].set_xlabel('Density (people/m²)')
     axes[1, 0].set_ylabel('Movement Speed (m/s)')
     axes[1, 0].set_title('Density vs Speed Relationship')
     axes[1, 0].grid(alpha=0.3)
     
     # Direction variance histogram
-    axes[1, 1].hist(frame['direction_variance'], bins=30, color='lightcoral', edgecolor='black')
-    axes[1, 1].axvline(frame['direction_variance'].mean(), color='red', linestyle='--', 
-                      linewidth=2, label=f'Mean: {frame["direction_variance"].mean():.1f}')
+    axes[1, 1].hist(dvar, bins=30, color='lightcoral', edgecolor='black')
+    axes[1, 1].axvline(v_mean, color='red', linestyle='--', 
+                      linewidth=2, label=f'Mean: {v_mean:.1f}')
     axes[1, 1].set_xlabel('Direction Variance (°)')
     axes[1, 1].set_ylabel('Frequency')
     axes[1, 1].set_title('Direction Variance Distribution')
@@ -194,10 +303,45 @@ def plot_spatial_statistics(processor: CrowdDataProcessor, timestamp: int, scena
     
     # Save
     output_path = f'results/test_visualizations/{scenario_name}_frame_{timestamp}_statistics.png'
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    print(f"✓ Saved: {output_path}")
+    future = save_figure_async(fig, output_path)
+    plt.close(fig)
+    
+    return future
+
+
+def visualize_scenario(scenario_name: str, key_frames: list):
+    """Generate all four plot types for one scenario"""
+    print(f"\n--- Processing: {scenario_name.upper()} ---")
     
-    return fig
+    processor = CrowdDataProcessor()
+    filepath = f'data/synthetic/{scenario_name}_scenario.csv'
+    processor.load_scenario(filepath)
+    
+    # Extract each key frame once and share it across the plots
+    mid_frame = key_frames[1]
+    frame_data = processor.get_frame(mid_frame)
+    density_grids = {ts: processor.create_density_grid(ts) for ts in key_frames}
+    
+    # 1. Single frame heatmap (middle frame)
+    print(f"Creating heatmap for frame {mid_frame}...")
+    plot_single_frame_heatmap(processor, mid_frame, scenario_name,
+                              density_grid=density_grids[mid_frame])
+    
+    # 2. Temporal evolution (center zone)
+    print(f"Creating temporal evolution plot...")
+    plot_temporal_evolution(processor, 5, 5, scenario_name)
+    
+    # 3. Frame comparison
+    print(f"Creating frame comparison...")
+    plot_comparison_frames(processor, key_frames, scenario_name,
+                           density_grids=density_grids)
+    
+    # 4. Spatial statistics
+    print(f"Creating spatial statistics...")
+    plot_spatial_statistics(processor, mid_frame, scenario_name, frame=frame_data)
+    
+    wait_for_writes()
+    print(f"✅ {scenario_name.upper()} visualizations complete\n")
 
 
 def run_all_visualizations():
@@ -206,8 +350,6 @@ def run_all_visualizations():
     print("GENERATING TEST VISUALIZATIONS")
     print("=" * 60)
     
-    processor = CrowdDataProcessor()
-    
     scenarios = [
         ('normal', [0, 100, 199]),
         ('rush_hour', [0, 100, 199]),
@@ -215,30 +357,8 @@ def run_all_visualizations():
         ('event_end', [0, 125, 249])
     ]
     
-    for scenario_name, key_frames in scenarios:
-        print(f"\n--- Processing: {scenario_name.upper()} ---")
-        
-        filepath = f'data/synthetic/{scenario_name}_scenario.csv'
-        processor.load_scenario(filepath)
-        
-        # 1. Single frame heatmap (middle frame)
-        mid_frame = key_frames[1]
-        print(f"Creating heatmap for frame {mid_frame}...")
-        plot_single_frame_heatmap(processor, mid_frame, scenario_name)
-        
-        # 2. Temporal evolution (center zone)
-        print(f"Creating temporal evolution plot...")
-        plot_temporal_evolution(processor, 5, 5, scenario_name)
-        
-        # 3. Frame comparison
-        print(f"Creating frame comparison...")
-        plot_comparison_frames(processor, key_frames, scenario_name)
-        
-        # 4. Spatial statistics
-        print(f"Creating spatial statistics...")
-        plot_spatial_statistics(processor, mid_frame, scenario_name)
-        
-        print(f"✅ {scenario_name.upper()} visualizations complete\n")
+    # Scenarios are independent, so plot them in parallel
+    run_scenarios_parallel(visualize_scenario, scenarios)
     
     print("=" * 60)
     print("✅ ALL VISUALIZATIONS GENERATED")
@@ -248,4 +368,4 @@ def run_all_visualizations():
 
 if __name__ == '__main__':
     run_all_visualizations()
-    plt.show()
\ No newline at end of file
+    _io_pool.shutdown(wait=True)
\ No newline at end of file
@@ -8,11 +8,21 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.utils.data_processor import CrowdDataProcessor
 from src.classification.zone_classifier import ZoneClassifier
-import matplotlib.pyplot as plt
-import seaborn as sns
+from src.utils.parallel import run_scenarios_parallel
+from functools import lru_cache
 import numpy as np
 
 
+@lru_cache(maxsize=None)
+def _get_plt():
+    """Import pyplot on first use, so classification-only runs skip matplotlib"""
+    import matplotlib
+    matplotlib.use('Agg')  # headless: figures are only written to disk
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
 def test_classifier_with_scenario(scenario_name: str, timestamp: int):
     """Test classifier with actual scenario data"""
     
@@ -43,9 +53,7 @@ def test_classifier_with_scenario(scenario_name: str, timestamp: int):
     print(f"  Zones Requiring Action: {summary['zones_requiring_action']}")
     print(f"  Elevated Zones: {summary['elevated_zones']}")
     print(f"\nLevel Distribution:")
-    for level in ['safe', 'moderate', 'warning', 'critical', 'emergency']:
-        count = summary['level_counts'][level]
-        pct = summary['level_percentages'][level]
+    for level, count, pct in summary['level_table']:
         print(f"  {level.capitalize():12} {count:3} ({pct:5.1f}%)")
 
     # Get critical zones
@@ -56,80 +64,81 @@ def test_classifier_with_scenario(scenario_name: str, timestamp: int):
             print(f"  {zone['zone_id']:12} - {zone['level'].upper():10} "
                 f"(Severity: {zone['severity']:.1f})")
 
-    return classified, summary
-
-def visualize_classification(scenario_name: str, timestamp: int):
-    """Create visualization of classification results"""
-    # Load and classify
-    processor = CrowdDataProcessor()
-    filepath = f'data/synthetic/{scenario_name}_scenario.csv'
-    processor.load_scenario(filepath)
-
-    frame_data = processor.get_frame(timestamp)
+    return processor, classified, summary
 
-    classifier = ZoneClassifier()
-    classified = classifier.classify_all_zones(frame_data)
+def visualize_classification(classified, density_grid: np.ndarray,
+                             scenario_name: str, timestamp: int):
+    """Create visualization of already computed classification results"""
+    plt = _get_plt()
+    from src.visualization.heatmap_visualizer import IMSHOW_KW
 
     # Create figure
     fig, axes = plt.subplots(1, 2, figsize=(18, 8))
 
     # 1. Density heatmap
-    density_grid = processor.create_density_grid(timestamp)
-    sns.heatmap(
-        density_grid,
-        annot=True,
-        fmt='.1f',
-        cmap='YlOrRd',
-        vmin=0,
-        vmax=8,
-        cbar_kws={'label': 'Density (people/m²)'},
-        ax=axes[0]
-    )
+    im = axes[0].imshow(density_grid, cmap='YlOrRd', vmin=0, vmax=8,
+                        aspect='auto', **IMSHOW_KW)
+    fig.colorbar(im, ax=axes[0], label='Density (people/m²)')
+    for (i, j), value in np.ndenumerate(density_grid):
+        if value < 0.05:
+            continue  # would print as 0.0; empty cells need no label
+        axes[0].text(j, i, f'{value:.1f}', ha='center', va='center', fontsize=9,
+                     color='black' if value < 5 else 'white')
     axes[0].set_title(f'Density Distribution\n{scenario_name.title()} - Frame {timestamp}',
                     fontsize=13, fontweight='bold')
 
     # 2. Classification heatmap
     # Create classification grid with numeric values
-    class_grid = np.zeros((10, 10))
     level_map = {'safe': 0, 'moderate': 1, 'warning': 2, 'critical': 3, 'emergency': 4}
+    levels = classified['level'].map(level_map).to_numpy(dtype=np.int8)
+    xs = classified['x'].to_numpy(dtype=np.intp)
+    ys = classified['y'].to_numpy(dtype=np.intp)
 
-    for _, zone in classified.iterrows():
-        x, y = int(zone['x']), int(zone['y'])
-        class_grid[x, y] = level_map[zone['level']]
+    # Scatter all zone levels into the grid in one step
+    class_grid = np.zeros((10, 10), dtype=np.int8)
+    class_grid[xs, ys] = levels
 
     # Custom colormap
     colors = ['#00FF00', '#7FFF00', '#FFFF00', '#FF8C00', '#FF0000']
     n_bins = 5
     cmap = plt.matplotlib.colors.ListedColormap(colors)
 
-    sns.heatmap(
-        class_grid,
-        annot=False,
-        cmap=cmap,
-        vmin=0,
-        vmax=4,
-        cbar_kws={'label': 'Classification Level',
-                'ticks': [0, 1, 2, 3, 4]},
-        ax=axes[1]
-    )
+    im = axes[1].imshow(class_grid, cmap=cmap, vmin=0, vmax=4,
+                        aspect='auto', **IMSHOW_KW)
 
     # Customize colorbar labels
-    colorbar = axes[1].collections[0].colorbar
+    colorbar = fig.colorbar(im, ax=axes[1], label='Classification Level',
+                            ticks=[0, 1, 2, 3, 4])
     colorbar.set_ticklabels(['Safe', 'Moderate', 'Warning', 'Critical', 'Emergency'])
 
     axes[1].set_title(f'Classification Map\n{scenario_name.title()} - Frame {timestamp}',
                     fontsize=13, fontweight='bold')
 
+    # One tick per zone on both panels
+    for ax in axes:
+        ax.set_xticks(np.arange(class_grid.shape[1]))
+        ax.set_yticks(np.arange(class_grid.shape[0]))
+
     plt.tight_layout()
 
     # Save
     os.makedirs('results/classification_tests', exist_ok=True)
     output_path = f'results/classification_tests/{scenario_name}_frame_{timestamp}_classification.png'
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    fig.savefig(output_path, dpi=100, bbox_inches=None, pad_inches=0.1)
+    plt.close(fig)
     print(f"\n✓ Visualization saved: {output_path}")
 
     return fig
 
+def classify_and_visualize(scenario_name: str, timestamp: int):
+    """Classify one scenario frame and save its visualization"""
+    # Load and classify once; the visualization reuses the results
+    processor, classified, summary = test_classifier_with_scenario(scenario_name, timestamp)
+    density_grid = processor.create_density_grid(timestamp)
+    visualize_classification(classified, density_grid, scenario_name, timestamp)
+
+    return summary
+
 def run_comprehensive_test():
     """Run comprehensive classification tests"""
     print("=" * 60)
@@ -143,12 +152,8 @@ def run_comprehensive_test():
         ('event_end', 200)
     ]
 
-    for scenario, timestamp in test_cases:
-        # Test classification
-        classified, summary = test_classifier_with_scenario(scenario, timestamp)
-        
-        # Create visualization
-        visualize_classification(scenario, timestamp)
+    # Test and visualize each scenario in its own process
+    run_scenarios_parallel(classify_and_visualize, test_cases)
 
     print("\n" + "=" * 60)
     print("✅ COMPREHENSIVE TEST COMPLETE")
@@ -157,4 +162,3 @@ def run_comprehensive_test():
 
 if __name__ == "__main__":
     run_comprehensive_test()
-    plt.show()
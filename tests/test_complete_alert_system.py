@@ -11,21 +11,21 @@ from src.utils.data_processor import CrowdDataProcessor
 from src.classification.zone_classifier import ZoneClassifier
 from src.alerts.instruction_generator import InstructionGenerator
 from src.alerts.alert_manager import AlertManager
-import time
+from src.utils.parallel import run_scenarios_parallel
+from functools import lru_cache
 
 
-def test_complete_system(scenario_name: str, timestamp: int):
-    """Test complete alert system with scenario"""
+def test_complete_system(processor: CrowdDataProcessor, classifier: ZoneClassifier,
+                         instructor: InstructionGenerator, alert_mgr: AlertManager,
+                         scenario_name: str, timestamp: int):
+    """Test complete alert system with scenario, reusing the given components"""
     
     print("\n" + "=" * 80)
     print(f"COMPLETE SYSTEM TEST: {scenario_name.upper()} - Frame {timestamp}")
     print("=" * 80)
     
-    # Initialize all components
-    processor = CrowdDataProcessor()
-    classifier = ZoneClassifier()
-    instructor = InstructionGenerator()
-    alert_mgr = AlertManager(cooldown_seconds=0.5)  # Short cooldown for testing
+    # Start each scenario without the previous one's alerts or cooldowns
+    alert_mgr.reset_alerts()
     
     # Load and process data
     print("\n1. Loading scenario data...")
@@ -46,6 +46,7 @@ def test_complete_system(scenario_name: str, timestamp: int):
     # Generate instructions
     print("\n3. Generating instructions...")
     instructions = instructor.generate_batch_instructions(classified)
+    inst_by_zone = {inst['zone_id']: inst for inst in instructions}  # one per zone
     inst_summary = instructor.generate_summary_report(instructions)
     print(f"   ✓ Generated {len(instructions)} instructions")
     print(f"   - Immediate Action Required: {inst_summary['requires_immediate_action']}")
@@ -126,10 +127,7 @@ def test_complete_system(scenario_name: str, timestamp: int):
     # Show top priority instruction
     if priority_alerts:
         top_alert = priority_alerts[0]
-        top_instruction = next(
-            (inst for inst in instructions if inst['zone_id'] == top_alert['zone_id']),
-            None
-        )
+        top_instruction = inst_by_zone.get(top_alert['zone_id'])
         
         if top_instruction:
             print("\n" + "=" * 80)
@@ -149,6 +147,22 @@ def test_complete_system(scenario_name: str, timestamp: int):
     }
 
 
+@lru_cache(maxsize=1)
+def _get_components():
+    """Build the system components once per worker process"""
+    return (
+        CrowdDataProcessor(),
+        ZoneClassifier(),
+        InstructionGenerator(),
+        AlertManager(cooldown_seconds=0.5)  # Short cooldown for testing
+    )
+
+
+def _run_scenario(scenario_name: str, timestamp: int):
+    """Worker entry point: run one scenario with this process's components"""
+    return test_complete_system(*_get_components(), scenario_name, timestamp)
+
+
 def run_all_scenarios():
     """Run complete system test on all scenarios"""
     
@@ -163,18 +177,14 @@ def run_all_scenarios():
         ('event_end', 200)
     ]
     
-    results = []
+    # Scenarios are independent, so run them in parallel; each worker process
+    # builds its components once and reuses them for every scenario it runs
+    outputs = run_scenarios_parallel(_run_scenario, test_cases)
     
-    for scenario, timestamp in test_cases:
-        result = test_complete_system(scenario, timestamp)
-        results.append({
-            'scenario': scenario,
-            'timestamp': timestamp,
-            'data': result
-        })
-        
-        # Small delay between scenarios
-        time.sleep(1)
+    results = [
+        {'scenario': scenario, 'timestamp': timestamp, 'data': result}
+        for (scenario, timestamp), result in zip(test_cases, outputs)
+    ]
     
     # Overall comparison
     print("\n\n" + "=" * 80)
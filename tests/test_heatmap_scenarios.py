@@ -10,35 +10,39 @@ from src.utils.data_processor import CrowdDataProcessor
 from src.classification.zone_classifier import ZoneClassifier
 from src.alerts.alert_manager import AlertManager
 from src.visualization.heatmap_visualizer import HeatmapVisualizer
+from src.utils.parallel import run_scenarios_parallel
+from functools import lru_cache
+import matplotlib
+matplotlib.use('Agg')  # headless: figures are only written to disk
 import matplotlib.pyplot as plt
 
 
-def generate_scenario_heatmaps(scenario_name: str, timestamp: int):
-    """Generate all heatmap types for a scenario"""
+def generate_scenario_heatmaps(processor: CrowdDataProcessor, classifier: ZoneClassifier,
+                               alert_mgr: AlertManager, visualizer: HeatmapVisualizer,
+                               scenario_name: str, timestamp: int):
+    """Generate all heatmap types for a scenario, reusing the given components"""
     
     print(f"\n{'='*80}")
     print(f"Generating heatmaps: {scenario_name.upper()} - Frame {timestamp}")
     print(f"{'='*80}")
     
     # Load and process data
-    processor = CrowdDataProcessor()
     processor.load_scenario(f'data/synthetic/{scenario_name}_scenario.csv')
     frame_data = processor.get_frame(timestamp)
     
     # Classify
-    classifier = ZoneClassifier()
     classified = classifier.classify_all_zones(frame_data)
     
-    # Alerts
-    alert_mgr = AlertManager()
+    # Alerts (fresh cooldowns for each scenario)
+    alert_mgr.reset_alerts()
     alerts = alert_mgr.process_classified_zones(classified)
     active_alerts = alert_mgr.get_active_alerts()
     
     # Density grid
     density_grid = processor.create_density_grid(timestamp)
     
-    # Initialize visualizer
-    visualizer = HeatmapVisualizer()
+    # Prepare the classification arrays once; all zone heatmaps below reuse it
+    zones = visualizer.prepare_zones(classified)
     
     # Create output directory
     output_dir = f'results/heatmaps/{scenario_name}'
@@ -56,7 +60,7 @@ def generate_scenario_heatmaps(scenario_name: str, timestamp: int):
     # 2. Classification Heatmap
     print("  Creating classification heatmap...")
     fig2 = visualizer.create_classification_heatmap(
-        classified,
+        zones,
         title=f"{scenario_name.replace('_', ' ').title()} Scenario\nClassification Map (Frame {timestamp})"
     )
     visualizer.save_heatmap(fig2, f'{output_dir}/classification_frame_{timestamp}.png')
@@ -66,7 +70,7 @@ def generate_scenario_heatmaps(scenario_name: str, timestamp: int):
     print("  Creating dual heatmap...")
     fig3 = visualizer.create_dual_heatmap(
         density_grid,
-        classified,
+        zones,
         title=f"{scenario_name.replace('_', ' ').title()} Scenario - Frame {timestamp}"
     )
     visualizer.save_heatmap(fig3, f'{output_dir}/dual_frame_{timestamp}.png')
@@ -77,7 +81,7 @@ def generate_scenario_heatmaps(scenario_name: str, timestamp: int):
         print("  Creating annotated heatmap...")
         fig4 = visualizer.create_annotated_heatmap(
             density_grid,
-            classified,
+            zones,
             active_alerts,
             title=f"{scenario_name.replace('_', ' ').title()} Scenario\nStatus with Alerts (Frame {timestamp})"
         )
@@ -95,6 +99,17 @@ def generate_scenario_heatmaps(scenario_name: str, timestamp: int):
     }
 
 
+@lru_cache(maxsize=1)
+def _get_components():
+    """Build the pipeline components once per worker process"""
+    return CrowdDataProcessor(), ZoneClassifier(), AlertManager(), HeatmapVisualizer()
+
+
+def _run_scenario(scenario_name: str, timestamp: int):
+    """Worker entry point: render one scenario with this process's components"""
+    return generate_scenario_heatmaps(*_get_components(), scenario_name, timestamp)
+
+
 def run_all_scenarios():
     """Generate heatmaps for all scenarios"""
     
@@ -109,11 +124,9 @@ def run_all_scenarios():
         ('event_end', 200)
     ]
     
-    results = []
-    
-    for scenario, timestamp in test_cases:
-        result = generate_scenario_heatmaps(scenario, timestamp)
-        results.append(result)
+    # Scenarios are independent, so render them in parallel; each worker process
+    # builds its components once and reuses them for every scenario it renders
+    results = run_scenarios_parallel(_run_scenario, test_cases)
     
     # Summary
     print("\n" + "=" * 80)
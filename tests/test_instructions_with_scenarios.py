@@ -9,28 +9,71 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.utils.data_processor import CrowdDataProcessor
 from src.classification.zone_classifier import ZoneClassifier
 from src.alerts.instruction_generator import InstructionGenerator
+from src.utils.parallel import run_scenarios_parallel
+from functools import lru_cache
+from contextlib import redirect_stdout
+import io
+import json
+import pytest
 
 
-def test_scenario_instructions(scenario_name: str, timestamp: int):
+# (scenario, timestamp) cases; each exports to its own JSON file, so they can
+# run in separate pytest-xdist workers: pytest -n 4 tests/test_instructions_with_scenarios.py
+SCENARIO_CASES = [
+    ('normal', 100),
+    ('rush_hour', 100),
+    ('emergency', 75),
+    ('event_end', 200)
+]
+
+
+@lru_cache(maxsize=8)
+def _load_processor(filepath: str) -> CrowdDataProcessor:
+    """Load a scenario once per process; get_frame hands out copies, so it is shared read-only"""
+    processor = CrowdDataProcessor()
+    processor.load_scenario(filepath)
+    
+    return processor
+
+
+@lru_cache(maxsize=1)
+def _get_components():
+    """Build the classifier (reads its JSON config) and generator once per process"""
+    return ZoneClassifier(), InstructionGenerator()
+
+
+def run_scenario_instructions(scenario_name: str, timestamp: int):
     """Test instruction generation with real scenario"""
     
+    # Buffer the whole report and write it once, so it never interleaves with other workers
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        result = _report_scenario_instructions(scenario_name, timestamp)
+    
+    sys.stdout.write(buf.getvalue())
+    
+    return result
+
+
+def _report_scenario_instructions(scenario_name: str, timestamp: int):
+    """Generate, print and export instructions for one scenario frame"""
+    
     print("\n" + "=" * 80)
     print(f"SCENARIO: {scenario_name.upper()} - Frame {timestamp}")
     print("=" * 80)
     
-    # Load and process data
-    processor = CrowdDataProcessor()
+    # Load and process data (reused across timestamps of the same scenario)
     filepath = f'data/synthetic/{scenario_name}_scenario.csv'
-    processor.load_scenario(filepath)
+    processor = _load_processor(filepath)
     
     frame_data = processor.get_frame(timestamp)
     
-    # Classify zones
-    classifier = ZoneClassifier()
+    # Classify zones (shared components; only the generator tracks history)
+    classifier, generator = _get_components()
+    generator.reset_history()
     classified = classifier.classify_all_zones(frame_data)
     
     # Generate instructions
-    generator = InstructionGenerator()
     instructions = generator.generate_batch_instructions(classified)
     
     # Get summary
@@ -44,9 +87,7 @@ def test_scenario_instructions(scenario_name: str, timestamp: int):
     print(f"Zones Requiring Action: {class_summary['zones_requiring_action']}")
     
     print("\nLevel Distribution:")
-    for level in ['safe', 'moderate', 'warning', 'critical', 'emergency']:
-        count = class_summary['level_counts'][level]
-        pct = class_summary['level_percentages'][level]
+    for level, count, pct in class_summary['level_table']:
         if count > 0:
             print(f"  {level.capitalize():12} {count:3} ({pct:5.1f}%)")
     
@@ -62,19 +103,19 @@ def test_scenario_instructions(scenario_name: str, timestamp: int):
             print(f"  {priority:12} {count}")
     
     print("\nExit Load Distribution:")
-    for exit_name, count in sorted(summary['exit_usage'].items()):
+    for exit_name, count in summary['exit_load']:
         pct = (count / summary['total_instructions']) * 100
         print(f"  {exit_name:12} {count:3} zones ({pct:5.1f}%)")
     
     # Show priority instructions
-    priority_instructions = generator.get_priority_instructions(instructions)
+    priority_instructions = generator.get_priority_instructions(instructions, limit=10)
     
     if priority_instructions:
         print("\n" + "=" * 80)
         print("HIGH-PRIORITY INSTRUCTIONS")
         print("=" * 80)
         
-        for inst in priority_instructions[:10]:  # Show top 10
+        for inst in priority_instructions:  # Top 10
             print(f"\n{generator.format_instruction_display(inst)}")
     
     # Export instructions
@@ -86,6 +127,24 @@ def test_scenario_instructions(scenario_name: str, timestamp: int):
     return instructions, summary
 
 
+@pytest.mark.parametrize("scenario,timestamp", SCENARIO_CASES)
+def test_scenario(scenario: str, timestamp: int):
+    """Instruction generation for one scenario, as its own pytest case"""
+    # Remove any export left by an earlier run so the check below sees this run's file
+    export_path = f'results/instructions/{scenario}_frame_{timestamp}_instructions.json'
+    if os.path.exists(export_path):
+        os.remove(export_path)
+    
+    instructions, summary = run_scenario_instructions(scenario, timestamp)
+    
+    assert summary['total_instructions'] == len(instructions) > 0
+    
+    with open(export_path) as f:
+        exported = json.load(f)
+    assert len(exported) == len(instructions)
+    assert [inst['zone_id'] for inst in exported] == [inst['zone_id'] for inst in instructions]
+
+
 def run_all_scenario_tests():
     """Run instruction tests on all scenarios"""
     
@@ -93,22 +152,15 @@ def run_all_scenario_tests():
     print("COMPREHENSIVE INSTRUCTION GENERATION TEST")
     print("=" * 80)
     
-    test_cases = [
-        ('normal', 100),
-        ('rush_hour', 100),
-        ('emergency', 75),
-        ('event_end', 200)
-    ]
+    test_cases = SCENARIO_CASES
     
-    all_results = []
+    # Scenarios are independent (each exports its own JSON), so run them in parallel
+    outputs = run_scenarios_parallel(run_scenario_instructions, test_cases)
     
-    for scenario, timestamp in test_cases:
-        instructions, summary = test_scenario_instructions(scenario, timestamp)
-        all_results.append({
-            'scenario': scenario,
-            'timestamp': timestamp,
-            'summary': summary
-        })
+    all_results = [
+        {'scenario': scenario, 'timestamp': timestamp, 'summary': summary}
+        for (scenario, timestamp), (instructions, summary) in zip(test_cases, outputs)
+    ]
     
     # Overall summary
     print("\n" + "=" * 80)